@@ -0,0 +1,40 @@
+"""make flow name unique only among active flows
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '024'
+down_revision = '023'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The unique name index predates the rename from questionnaire_flows
+    op.execute("DROP INDEX IF EXISTS ix_questionnaire_flows_name")
+    op.execute("DROP INDEX IF EXISTS ix_document_flows_name")
+    
+    op.create_index('ix_document_flows_name', 'document_flows', ['name'], unique=False)
+    
+    # Enforce name uniqueness among active flows only, so soft-deleted names can be reused
+    op.create_index(
+        'ux_flow_name_active',
+        'document_flows',
+        ['name'],
+        unique=True,
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active')
+    )
+
+
+def downgrade():
+    op.drop_index('ux_flow_name_active', table_name='document_flows')
+    op.drop_index('ix_document_flows_name', table_name='document_flows')
+    op.create_index('ix_document_flows_name', 'document_flows', ['name'], unique=True)
@@ -0,0 +1,39 @@
+"""add trigram indexes for people search
+
+Revision ID: 025
+Revises: 024
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '025'
+down_revision = '024'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_COLUMNS = ['name', 'email', 'employer']
+
+
+def upgrade():
+    # Trigram GIN indexes let Postgres serve the substring ILIKE filters in
+    # PersonService.get_people, combining the three ORs with a BitmapOr
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_people_{column}_trgm',
+            'people',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    for column in SEARCH_COLUMNS:
+        op.drop_index(f'ix_people_{column}_trgm', table_name='people')
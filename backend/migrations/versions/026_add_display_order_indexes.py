@@ -0,0 +1,36 @@
+"""add display order indexes for questions and question groups
+
+Revision ID: 026
+Revises: 025
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '026'
+down_revision = '025'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Questions are always read per group in display_order, both by
+    # list_questions_by_group and by the QuestionGroup.questions relationship
+    op.create_index(
+        'ix_questions_group_order',
+        'questions',
+        ['question_group_id', 'display_order']
+    )
+    op.create_index(
+        'ix_question_groups_display_order',
+        'question_groups',
+        ['display_order']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_question_groups_display_order', table_name='question_groups')
+    op.drop_index('ix_questions_group_order', table_name='questions')
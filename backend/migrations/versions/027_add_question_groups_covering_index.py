@@ -0,0 +1,31 @@
+"""add covering index for the active question group listing
+
+Revision ID: 027
+Revises: 026
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '027'
+down_revision = '026'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # list_question_groups filters on is_active and orders by id; the INCLUDE
+    # columns allow index-only scans for summary-column pages (PostgreSQL 11+)
+    op.create_index(
+        'ix_question_groups_active_id',
+        'question_groups',
+        ['is_active', 'id'],
+        postgresql_include=['name', 'identifier', 'display_order']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_question_groups_active_id', table_name='question_groups')
@@ -0,0 +1,42 @@
+"""add unique constraint on session answers per question
+
+Revision ID: 028
+Revises: 027
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '028'
+down_revision = '027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the newest answer where a question was answered more than once
+    # (plain subquery rather than DELETE ... USING so SQLite can run it too)
+    op.execute("""
+        DELETE FROM session_answers
+        WHERE id NOT IN (
+            SELECT MAX(id)
+            FROM session_answers
+            GROUP BY session_id, question_id
+        )
+    """)
+
+    # Conflict target for the answer upserts in SessionService; batch mode
+    # rebuilds the table on SQLite, which cannot ALTER in a constraint
+    with op.batch_alter_table('session_answers') as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_session_answers_session_question',
+            ['session_id', 'question_id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('session_answers') as batch_op:
+        batch_op.drop_constraint('uq_session_answers_session_question', type_='unique')
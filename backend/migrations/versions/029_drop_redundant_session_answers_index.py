@@ -0,0 +1,31 @@
+"""drop session_answers session_id index covered by the unique constraint
+
+Revision ID: 029
+Revises: 028
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '029'
+down_revision = '028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # uq_session_answers_session_question (session_id, question_id) serves
+    # session_id lookups, so the single-column index only adds write cost
+    op.drop_index('ix_session_answers_session_id', table_name='session_answers')
+
+
+def downgrade():
+    op.create_index(
+        'ix_session_answers_session_id',
+        'session_answers',
+        ['session_id'],
+        unique=False
+    )
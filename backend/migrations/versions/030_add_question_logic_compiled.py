@@ -0,0 +1,29 @@
+"""add compiled question logic to question groups
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '030'
+down_revision = '029'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Left NULL for existing groups; the plan is compiled on read until the
+    # group's logic is next saved
+    op.add_column(
+        'question_groups',
+        sa.Column('question_logic_compiled', sa.JSON(), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column('question_groups', 'question_logic_compiled')
@@ -0,0 +1,36 @@
+"""add indexes for the session and template listings
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '031'
+down_revision = '030'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # list_sessions filters on user_id and orders by created_at desc
+    op.create_index(
+        'ix_document_sessions_user_created',
+        'document_sessions',
+        ['user_id', 'created_at']
+    )
+    # list_templates filters on is_active and orders by created_at desc
+    op.create_index(
+        'ix_templates_active_created',
+        'templates',
+        ['is_active', 'created_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_templates_active_created', table_name='templates')
+    op.drop_index('ix_document_sessions_user_created', table_name='document_sessions')
@@ -0,0 +1,32 @@
+"""add trigram index for template name search
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '032'
+down_revision = '031'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trigram GIN index for the substring ILIKE search in
+    # TemplateService.list_templates; pg_trgm is installed by migration 025
+    op.create_index(
+        'ix_templates_name_trgm',
+        'templates',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_templates_name_trgm', table_name='templates')
@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "postgresql://localhost:5432/estate_docs_dev"
     test_database_url: str = "postgresql://localhost:5432/estate_docs_test"
+    # Connection pool (ignored for SQLite). Set db_null_pool when an external
+    # pooler such as PgBouncer in transaction mode does the pooling
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 3600
+    db_null_pool: bool = False
     
     # JWT
     jwt_secret_key: str
@@ -37,9 +44,14 @@ class Settings(BaseSettings):
     generated_dir: str = "./generated"
     document_uploads_dir: str = "./document_uploads"
     max_upload_size_mb: int = 10
+    # PDF text extraction: "pdfium" (fast, used when pypdfium2 is installed) or "pdfplumber"
+    pdf_text_extractor: str = "pdfium"
     
     # OpenAI
     openai_api_key: Optional[str] = None
+    # OCR results are cached here by document content hash; empty disables the cache.
+    # Entries are touched on use, so the directory can be pruned by mtime
+    ocr_cache_dir: str = "./ocr_cache"
     
     # Environment
     environment: str = "development"
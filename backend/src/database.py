@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from typing import Generator
 from .config import settings
 
@@ -14,12 +15,25 @@ if settings.database_url.startswith('sqlite'):
     )
 else:
     # PostgreSQL and other databases
+    engine_options = {}
+    if make_url(settings.database_url).get_driver_name() == 'psycopg2':
+        # Batch executemany UPDATE/DELETE with execute_batch; INSERTs already use multi-row VALUES
+        engine_options['executemany_mode'] = 'values_plus_batch'
+    if settings.db_null_pool:
+        # Connections are pooled outside the process; open one per checkout
+        engine_options['poolclass'] = NullPool
+    else:
+        engine_options.update(
+            pool_pre_ping=True,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle
+        )
     engine = create_engine(
         settings.database_url,
-        pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20,
-        echo=False
+        echo=False,
+        **engine_options
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -37,3 +51,19 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def commit_keeping_loaded(db: Session, *instances) -> None:
+    """
+    Commit freshly written instances without a follow-up SELECT.
+
+    Pending changes are flushed first. Primary keys come back from the
+    INSERT and every other default is applied client-side, so the instances
+    are detached across the commit to keep them from being expired, then
+    re-attached still fully loaded.
+    """
+    db.flush()
+    for instance in instances:
+        db.expunge(instance)
+    db.commit()
+    db.add_all(instances)
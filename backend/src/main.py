@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
+from .services.template_service import UPLOAD_DIR
 from .routers import auth, users, question_groups, templates, sessions, documents, flows, people
 
 app = FastAPI(
@@ -31,6 +32,12 @@ app.include_router(flows.router, prefix="/api/v1")
 app.include_router(people.router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+def create_upload_dir():
+    """Create the template upload directory once, rather than on every upload"""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
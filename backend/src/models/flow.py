@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, JSON, Index, text
 from sqlalchemy.orm import relationship
 from . import Base, TimestampMixin, SoftDeleteMixin
 
@@ -17,9 +17,19 @@ class DocumentFlow(Base, TimestampMixin, SoftDeleteMixin):
     """Document flow model for managing multiple document workflows."""
     
     __tablename__ = "document_flows"
+    __table_args__ = (
+        # Names only need to be unique among active flows; enforced by the database
+        Index(
+            "ux_flow_name_active",
+            "name",
+            unique=True,
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, unique=True, index=True)
+    name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
     
     # Flow logic stored as JSON (list of steps with groups and conditionals)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, Enum, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 import enum
 from . import Base, TimestampMixin, SoftDeleteMixin
@@ -18,6 +18,18 @@ class QuestionGroup(Base, TimestampMixin, SoftDeleteMixin):
     """Question group model."""
     
     __tablename__ = "question_groups"
+    __table_args__ = (
+        # Serves "first/next group by display_order" lookups when starting and advancing sessions
+        Index("ix_question_groups_display_order", "display_order"),
+        # Serves the active-only group listing (filtered on is_active, ordered by id);
+        # on PostgreSQL the INCLUDE columns let summary-column pages use an index-only scan
+        Index(
+            "ix_question_groups_active_id",
+            "is_active",
+            "id",
+            postgresql_include=["name", "identifier", "display_order"]
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -28,12 +40,15 @@ class QuestionGroup(Base, TimestampMixin, SoftDeleteMixin):
     # Question logic stored as JSON (list of question items with conditionals)
     # Structure: [{ type: 'question', questionId: 123 }, { type: 'conditional', ifIdentifier: 'prev_q', value: 'yes', nestedItems: [...] }]
     question_logic = Column(JSON, nullable=True)
+    # question_logic flattened into an executable plan (see utils.question_logic), kept in sync on update
+    question_logic_compiled = Column(JSON, nullable=True)
     
     # Relationships
     questions = relationship(
         "Question",
         back_populates="question_group",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Question.display_order"
     )
     
@@ -60,9 +75,13 @@ class Question(Base, TimestampMixin, SoftDeleteMixin):
     """Question model."""
     
     __tablename__ = "questions"
+    __table_args__ = (
+        # Serves per-group question listings ordered by display_order without a sort step
+        Index("ix_questions_group_order", "question_group_id", "display_order"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    question_group_id = Column(Integer, ForeignKey("question_groups.id"), nullable=False, index=True)
+    question_group_id = Column(Integer, ForeignKey("question_groups.id", ondelete="CASCADE"), nullable=False, index=True)
     question_text = Column(Text, nullable=False)
     question_type = Column(String(50), nullable=False)  # Validated by Pydantic schema
     identifier = Column(String(100), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from . import Base, TimestampMixin
@@ -8,6 +8,10 @@ class InputForm(Base, TimestampMixin):
     """Input form model for tracking client document progress."""
     
     __tablename__ = "document_sessions"
+    __table_args__ = (
+        # Serves a user's session listing, newest first (read as a backward index scan)
+        Index("ix_document_sessions_user_created", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     client_identifier = Column(String(255), nullable=False, index=True)
@@ -45,9 +49,14 @@ class SessionAnswer(Base, TimestampMixin):
     """Session answer model for storing client answers to questions."""
     
     __tablename__ = "session_answers"
+    __table_args__ = (
+        # One answer per question per session; also the conflict target for answer upserts.
+        # Its index leads with session_id, so it also serves per-session answer reads.
+        UniqueConstraint("session_id", "question_id", name="uq_session_answers_session_question"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("document_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    session_id = Column(Integer, ForeignKey("document_sessions.id", ondelete="CASCADE"), nullable=False)
     question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False, index=True)
     answer_value = Column(Text, nullable=False)
     
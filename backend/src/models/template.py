@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
+import re
 from . import Base, TimestampMixin, SoftDeleteMixin
 
 
+# Matches <<identifier>> placeholders in markdown content
+IDENTIFIER_PATTERN = re.compile(r'<<([^>]+)>>')
+
+
 class TemplateType(str, enum.Enum):
     """Template type enumeration."""
     WORD = "word"
@@ -17,6 +22,10 @@ class Template(Base, TimestampMixin, SoftDeleteMixin):
     """Template model for document templates."""
     
     __tablename__ = "templates"
+    __table_args__ = (
+        # Serves the active template listing, newest first
+        Index("ix_templates_active_created", "is_active", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -61,7 +70,5 @@ class Template(Base, TimestampMixin, SoftDeleteMixin):
     
     def extract_identifiers(self) -> list[str]:
         """Extract all identifiers from markdown content (e.g., <<identifier>>)."""
-        import re
-        pattern = r'<<([^>]+)>>'
-        matches = re.findall(pattern, self.markdown_content)
-        return list(set(matches))  # Return unique identifiers
+        # Unique identifiers in order of first appearance
+        return list(dict.fromkeys(m.group(1) for m in IDENTIFIER_PATTERN.finditer(self.markdown_content)))
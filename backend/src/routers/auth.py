@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Response, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Response, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..schemas.auth import (
@@ -155,6 +155,7 @@ async def get_current_user(
 @router.post("/forgot-password", response_model=MessageResponse)
 async def forgot_password(
     forgot_data: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ) -> MessageResponse:
     """
@@ -162,7 +163,7 @@ async def forgot_password(
     
     - **email**: Email address associated with account
     """
-    AuthService.forgot_password(db, forgot_data.email)
+    AuthService.forgot_password(db, forgot_data.email, background_tasks)
     return MessageResponse(
         message="If the email exists, a password reset link has been sent"
     )
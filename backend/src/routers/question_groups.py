@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from collections import defaultdict
+from typing import Dict, List
 from ..database import get_db
 from ..models import QuestionGroup
 from ..schemas.question import (
@@ -20,7 +21,7 @@ router = APIRouter(prefix="/question-groups", tags=["Question Groups"])
 
 
 @router.get("", response_model=QuestionGroupListResponse)
-async def list_question_groups(
+def list_question_groups(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     include_inactive: bool = Query(False, description="Include inactive groups"),
@@ -31,15 +32,31 @@ async def list_question_groups(
     List all question groups with pagination (admin only).
     """
     skip = (page - 1) * page_size
-    groups, total = QuestionGroupService.list_question_groups(
-        db, skip, page_size, include_inactive
+    groups, total = QuestionGroupService.list_question_group_rows(
+        db,
+        ["id", "name", "description", "identifier", "display_order",
+         "created_at", "updated_at", "is_active"],
+        skip, page_size, include_inactive
     )
-    
-    # Get questions for each group to include identifiers and types
+
+    # Active questions for the whole page in one query, in display order
+    questions_by_group: Dict[int, List[dict]] = defaultdict(list)
+    for q in QuestionService.list_question_rows(
+        db, [g.id for g in groups],
+        ["question_group_id", "id", "identifier", "question_text", "question_type"]
+    ):
+        questions_by_group[q.question_group_id].append({
+            "id": q.id,
+            "identifier": q.identifier,
+            "question_text": q.question_text,
+            "question_type": q.question_type
+        })
+
+    # Rows come straight from the database, so skip re-validating them
     group_responses = []
     for g in groups:
-        questions = QuestionService.list_questions_by_group(db, g.id, include_inactive=False)
-        group_response = QuestionGroupResponse(
+        questions = questions_by_group[g.id]
+        group_response = QuestionGroupResponse.model_construct(
             id=g.id,
             name=g.name,
             description=g.description,
@@ -49,14 +66,7 @@ async def list_question_groups(
             updated_at=g.updated_at,
             is_active=g.is_active,
             question_count=len(questions),
-            questions=[
-                {
-                    "id": q.id,
-                    "identifier": q.identifier,
-                    "question_text": q.question_text,
-                    "question_type": q.question_type
-                } for q in questions
-            ]
+            questions=questions
         )
         group_responses.append(group_response)
     
@@ -69,7 +79,7 @@ async def list_question_groups(
 
 
 @router.get("/{group_id}", response_model=QuestionGroupDetailResponse)
-async def get_question_group(
+def get_question_group(
     group_id: int,
     current_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -77,15 +87,15 @@ async def get_question_group(
     """
     Get question group by ID with all questions (admin only).
     """
-    group = QuestionGroupService.get_question_group_by_id(db, group_id)
+    group = QuestionGroupService.get_question_group_by_id(db, group_id, load_questions=True)
     if not group:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question group not found"
         )
     
-    # Get questions for this group
-    questions = QuestionService.list_questions_by_group(db, group_id, include_inactive=True)
+    # Questions are eager-loaded in display order
+    questions = group.questions
     
     return QuestionGroupDetailResponse(
         id=group.id,
@@ -103,7 +113,7 @@ async def get_question_group(
 
 
 @router.post("", response_model=QuestionGroupResponse, status_code=status.HTTP_201_CREATED)
-async def create_question_group(
+def create_question_group(
     group_data: QuestionGroupCreate,
     current_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -116,7 +126,7 @@ async def create_question_group(
 
 
 @router.put("/{group_id}", response_model=QuestionGroupResponse)
-async def update_question_group(
+def update_question_group(
     group_id: int,
     group_data: QuestionGroupUpdate,
     current_user: dict = Depends(require_admin),
@@ -126,7 +136,10 @@ async def update_question_group(
     Update question group (admin only).
     """
     group = QuestionGroupService.update_question_group(db, group_id, group_data)
-    questions = QuestionService.list_questions_by_group(db, group_id, include_inactive=False)
+    questions = QuestionService.list_questions_by_group(
+        db, group_id, include_inactive=False,
+        columns=["identifier", "question_text", "question_type"]
+    )
     return QuestionGroupResponse(
         id=group.id,
         name=group.name,
@@ -150,7 +163,7 @@ async def update_question_group(
 
 
 @router.delete("/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_question_group(
+def delete_question_group(
     group_id: int,
     current_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -163,7 +176,7 @@ async def delete_question_group(
 
 # Question endpoints within a group
 @router.post("/{group_id}/questions", response_model=QuestionResponse, status_code=status.HTTP_201_CREATED)
-async def create_question(
+def create_question(
     group_id: int,
     question_data: QuestionCreate,
     current_user: dict = Depends(require_admin),
@@ -179,7 +192,7 @@ async def create_question(
 
 
 @router.get("/{group_id}/questions", response_model=List[QuestionResponse])
-async def list_questions(
+def list_questions(
     group_id: int,
     include_inactive: bool = Query(False, description="Include inactive questions"),
     current_user: dict = Depends(require_admin),
@@ -188,12 +201,14 @@ async def list_questions(
     """
     List all questions in a group (admin only).
     """
-    questions = QuestionService.list_questions_by_group(db, group_id, include_inactive)
-    return [QuestionResponse.model_validate(q) for q in questions]
+    rows = QuestionService.list_question_rows(
+        db, [group_id], list(QuestionResponse.model_fields), include_inactive
+    )
+    return [QuestionResponse.model_construct(**row._mapping) for row in rows]
 
 
 @router.put("/questions/{question_id}", response_model=QuestionResponse)
-async def update_question(
+def update_question(
     question_id: int,
     question_data: QuestionUpdate,
     current_user: dict = Depends(require_admin),
@@ -207,7 +222,7 @@ async def update_question(
 
 
 @router.delete("/questions/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_question(
+def delete_question(
     question_id: int,
     current_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -219,7 +234,7 @@ async def delete_question(
 
 
 @router.get("/questions/check-identifier")
-async def check_question_identifier(
+def check_question_identifier(
     identifier: str = Query(..., description="Identifier to check"),
     group_id: int = Query(..., description="Question group ID for namespace"),
     exclude_id: int = Query(None, description="Question ID to exclude from check"),
@@ -232,14 +247,14 @@ async def check_question_identifier(
     Returns { exists: bool, question_id: int | null }
     """
     # Get the group to build the namespaced identifier
-    group = db.query(QuestionGroup).filter(QuestionGroup.id == group_id).first()
+    group = db.get(QuestionGroup, group_id)
     if not group:
         return {"exists": False, "question_id": None}
     
     # Build the namespaced identifier
     namespaced_identifier = f"{group.identifier}.{identifier}"
     
-    question = QuestionService.get_question_by_identifier(db, namespaced_identifier)
-    if question and (exclude_id is None or question.id != exclude_id):
-        return {"exists": True, "question_id": question.id}
+    question_id = QuestionService.get_question_id_by_identifier(db, namespaced_identifier)
+    if question_id is not None and (exclude_id is None or question_id != exclude_id):
+        return {"exists": True, "question_id": question_id}
     return {"exists": False, "question_id": None}
@@ -130,7 +130,7 @@ async def get_session_progress(
     # Get current group details
     current_group = None
     if session.current_group_id and not session.is_completed:
-        group = QuestionGroupService.get_question_group_by_id(db, session.current_group_id)
+        group = QuestionGroupService.get_question_group_by_id(db, session.current_group_id, load_questions=True)
         if group:
             current_group = {
                 "id": group.id,
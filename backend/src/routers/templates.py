@@ -9,6 +9,7 @@ from ..schemas.template import (
     TemplateCreate,
     TemplateUpdate,
     TemplateResponse,
+    TemplateListItem,
     TemplateListResponse,
     TemplateIdentifiersResponse,
     FileUploadResponse
@@ -94,7 +95,7 @@ async def list_templates(
     current_page = (skip // page_size) + 1 if page_size > 0 else 1
     
     return TemplateListResponse(
-        templates=[TemplateResponse.model_validate(t) for t in templates],
+        templates=[TemplateListItem.model_validate(t) for t in templates],
         total=total,
         page=current_page,
         page_size=page_size,
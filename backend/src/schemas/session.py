@@ -76,6 +76,9 @@ class SessionProgressResponse(BaseModel):
 
 class QuestionToDisplay(BaseModel):
     """Schema for a question to display in the document."""
+    # Built with model_construct from question rows; extra row columns are dropped
+    model_config = {"extra": "ignore"}
+
     id: int
     identifier: str
     question_text: str
@@ -41,9 +41,25 @@ class TemplateResponse(TemplateBase):
         from_attributes = True
 
 
+class TemplateListItem(TemplateBase):
+    """Schema for a template in a list, without its markdown content."""
+    id: int
+    template_type: str
+    original_filename: Optional[str]
+    original_file_path: Optional[str]
+    identifiers: Optional[str]
+    created_by: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+
 class TemplateListResponse(BaseModel):
     """Schema for paginated template list response."""
-    templates: list[TemplateResponse]
+    templates: list[TemplateListItem]
     total: int
     page: int
     page_size: int
@@ -11,7 +11,7 @@ from ..utils.security import (
     generate_password_reset_token,
 )
 from ..utils.email import send_password_reset_email
-from fastapi import HTTPException, status
+from fastapi import BackgroundTasks, HTTPException, status
 
 
 class AuthService:
@@ -134,16 +134,22 @@ class AuthService:
         return new_user
     
     @staticmethod
-    def forgot_password(db: Session, email: str) -> bool:
+    def forgot_password(
+        db: Session,
+        email: str,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> bool:
         """
         Initiate password reset process.
         
         Args:
             db: Database session
             email: User email
+            background_tasks: If given, the email is sent after the response
+                instead of while the request waits on the SMTP server
             
         Returns:
-            True if email sent successfully
+            True if email sent successfully (or queued)
         """
         user = db.query(User).filter(
             User.email == email,
@@ -168,7 +174,10 @@ class AuthService:
         db.commit()
         
         # Send email
-        send_password_reset_email(user.email, token)
+        if background_tasks is not None:
+            background_tasks.add_task(send_password_reset_email, user.email, token)
+        else:
+            send_password_reset_email(user.email, token)
         
         return True
     
@@ -1,7 +1,7 @@
 """Service layer for document generation and merge operations."""
 
 from sqlalchemy.orm import Session
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Iterable, Iterator
 from fastapi import HTTPException, status
 import re
 from datetime import datetime
@@ -11,7 +11,7 @@ import io
 import json
 
 from ..models.document import GeneratedDocument
-from ..models.template import Template
+from ..models.template import Template, IDENTIFIER_PATTERN
 from ..models.session import InputForm, SessionAnswer
 from ..models.question import Question
 from ..models.person import Person
@@ -39,10 +39,7 @@ class DocumentService:
             Generated document
         """
         # Get template
-        template = db.query(Template).filter(
-            Template.id == request.template_id,
-            Template.is_active == True
-        ).first()
+        template = DocumentService._get_active_template(db, request.template_id)
 
         if not template:
             raise HTTPException(
@@ -51,10 +48,7 @@ class DocumentService:
             )
 
         # Get session (verify user owns it)
-        session = db.query(InputForm).filter(
-            InputForm.id == request.session_id,
-            InputForm.user_id == user_id
-        ).first()
+        session = DocumentService._get_owned_session(db, request.session_id, user_id)
 
         if not session:
             raise HTTPException(
@@ -62,13 +56,10 @@ class DocumentService:
                 detail="Session not found"
             )
 
-        # Get all answers for the session
-        answers = db.query(SessionAnswer).filter(
-            SessionAnswer.session_id == request.session_id
-        ).all()
-
         # Build answer map: identifier -> answer_value
-        answer_map = DocumentService._build_answer_map(db, answers)
+        answer_map = DocumentService._build_answer_map(
+            DocumentService._iter_answer_rows(db, request.session_id)
+        )
 
         # Merge template with answers
         merged_content = DocumentService._merge_template(
@@ -96,34 +87,79 @@ class DocumentService:
         return document
 
     @staticmethod
-    def _build_answer_map(db: Session, answers: List[SessionAnswer]) -> dict:
+    def _get_active_template(db: Session, template_id: int) -> Optional[Template]:
         """
-        Build a map of question identifiers to answer values.
+        Get an active template by primary key via the identity map.
 
         Args:
             db: Database session
-            answers: List of session answers
+            template_id: Template ID
 
         Returns:
-            Dictionary mapping identifiers to answer values
+            Template if found and active, None otherwise
         """
-        answer_map = {}
+        template = db.get(Template, template_id)
+        return template if template and template.is_active else None
+
+    @staticmethod
+    def _get_owned_session(db: Session, session_id: int, user_id: int) -> Optional[InputForm]:
+        """
+        Get a session if it belongs to the user.
+
+        Args:
+            db: Database session
+            session_id: Session ID
+            user_id: User ID
+
+        Returns:
+            Session if found and owned by the user, None otherwise
+        """
+        return db.query(InputForm).filter(
+            InputForm.id == session_id,
+            InputForm.user_id == user_id
+        ).first()
+
+    @staticmethod
+    def _iter_answer_rows(db: Session, session_id: int) -> Iterator[Tuple[str, str, str]]:
+        """
+        Stream a session's answers joined with their questions.
 
-        for answer in answers:
-            # Get question to find its identifier
-            question = db.query(Question).filter(
-                Question.id == answer.question_id
-            ).first()
+        Rows are fetched in chunks via yield_per so sessions with thousands
+        of answers never materialize the full result set at once.
 
-            if question:
-                # Format person answers with conjunctions
-                formatted_value = DocumentService._format_answer_value(
-                    answer.answer_value,
-                    question.question_type
-                )
-                answer_map[question.identifier] = formatted_value
+        Args:
+            db: Database session
+            session_id: Session ID
 
-        return answer_map
+        Yields:
+            Tuples of (identifier, question_type, answer_value)
+        """
+        return db.query(
+            Question.identifier,
+            Question.question_type,
+            SessionAnswer.answer_value
+        ).join(
+            SessionAnswer, SessionAnswer.question_id == Question.id
+        ).filter(
+            SessionAnswer.session_id == session_id
+        ).yield_per(500)
+
+    @staticmethod
+    def _build_answer_map(answer_rows: Iterable[Tuple[str, str, str]]) -> dict:
+        """
+        Build a map of question identifiers to answer values.
+
+        Args:
+            answer_rows: Iterable of (identifier, question_type, answer_value) rows
+
+        Returns:
+            Dictionary mapping identifiers to answer values
+        """
+        # Format person answers with conjunctions
+        return {
+            identifier: DocumentService._format_answer_value(answer_value, question_type)
+            for identifier, question_type, answer_value in answer_rows
+        }
 
     @staticmethod
     def _format_answer_value(answer_value: str, question_type: str) -> str:
@@ -202,6 +238,13 @@ class DocumentService:
         Returns:
             Merged content with identifiers replaced
         """
+        # Fast path: substring scans are far cheaper than running every
+        # pattern below against content with nothing to merge or number
+        if not any(marker in template_content for marker in ('<<', '{{', '[[', '#')):
+            if '  ' in template_content:
+                return re.sub(r'  +', ' ', template_content)
+            return template_content
+
         merged_content = template_content
 
         # First, process {{ IF <<identifier>> = "value" }} ... {{ END }} blocks (equality check)
@@ -303,8 +346,7 @@ class DocumentService:
             logger.info(f"Processing conditional section: '{section_content}'")
 
             # Find all identifiers in this section
-            identifier_pattern = r'<<([^>]+)>>'
-            identifiers_in_section = re.findall(identifier_pattern, section_content)
+            identifiers_in_section = IDENTIFIER_PATTERN.findall(section_content)
             logger.info(f"Identifiers in section: {identifiers_in_section}")
 
             if not identifiers_in_section:
@@ -334,7 +376,6 @@ class DocumentService:
         merged_content = re.sub(conditional_pattern, process_conditional_section, merged_content, flags=re.DOTALL)
 
         # Then, replace all identifiers with their values
-        pattern = r'<<([^>]+)>>'
 
         def replace_identifier(match):
             identifier = match.group(1)
@@ -402,7 +443,8 @@ class DocumentService:
                 return value
             return ''
         
-        merged_content = re.sub(pattern, replace_identifier, merged_content)
+        if '<<' in merged_content:
+            merged_content = IDENTIFIER_PATTERN.sub(replace_identifier, merged_content)
         
         # Finally, replace ## with auto-incrementing counter and #^. with current counter (no increment)
         # Use a simple pattern - ## anywhere in the text
@@ -448,10 +490,7 @@ class DocumentService:
             Preview data including merged content and missing identifiers
         """
         # Get template
-        template = db.query(Template).filter(
-            Template.id == template_id,
-            Template.is_active == True
-        ).first()
+        template = DocumentService._get_active_template(db, template_id)
         
         if not template:
             raise HTTPException(
@@ -460,10 +499,7 @@ class DocumentService:
             )
         
         # Get session
-        session = db.query(InputForm).filter(
-            InputForm.id == session_id,
-            InputForm.user_id == user_id
-        ).first()
+        session = DocumentService._get_owned_session(db, session_id, user_id)
         
         if not session:
             raise HTTPException(
@@ -471,21 +507,16 @@ class DocumentService:
                 detail="Session not found"
             )
         
-        # Get answers
-        answers = db.query(SessionAnswer).filter(
-            SessionAnswer.session_id == session_id
-        ).all()
-        
-        answer_map = DocumentService._build_answer_map(db, answers)
+        answer_map = DocumentService._build_answer_map(
+            DocumentService._iter_answer_rows(db, session_id)
+        )
         
         # Get template identifiers
-        template_identifiers = template.extract_identifiers()
+        template_identifiers = set(template.extract_identifiers())
         
-        # Find missing identifiers
-        missing_identifiers = [
-            identifier for identifier in template_identifiers
-            if identifier not in answer_map
-        ]
+        # Find missing identifiers and the answered ones this template uses
+        missing_identifiers = sorted(template_identifiers - answer_map.keys())
+        available_identifiers = sorted(template_identifiers & answer_map.keys())
         
         # Merge content
         merged_content = DocumentService._merge_template(
@@ -498,7 +529,7 @@ class DocumentService:
             "session_client": session.client_identifier,
             "markdown_content": merged_content,
             "missing_identifiers": missing_identifiers,
-            "available_identifiers": list(answer_map.keys())
+            "available_identifiers": available_identifiers
         }
     
     @staticmethod
@@ -603,38 +634,24 @@ class DocumentService:
             Bytes of the generated Word document
         """
         # Get template
-        template = db.query(Template).filter(
-            Template.id == template_id,
-            Template.is_active == True
-        ).first()
+        template = DocumentService._get_active_template(db, template_id)
         
         if not template:
             raise ValueError("Template not found")
         
         # Get session (verify user owns it)
-        session = db.query(InputForm).filter(
-            InputForm.id == session_id,
-            InputForm.user_id == user_id
-        ).first()
+        session = DocumentService._get_owned_session(db, session_id, user_id)
         
         if not session:
             raise ValueError("Session not found")
         
-        # Get all answers for this session with their question identifiers
-        answers_query = db.query(SessionAnswer, Question).join(
-            Question, SessionAnswer.question_id == Question.id
-        ).filter(
-            SessionAnswer.session_id == session_id
-        ).all()
-        
         # Build a mapping of identifier -> answer value (with formatting for person types)
+        # and a raw answer map (before formatting) for person JSON data in one streamed pass
         answer_map = {}
-        for answer, question in answers_query:
-            formatted_value = DocumentService._format_answer_value(
-                answer.answer_value,
-                question.question_type
-            )
-            answer_map[question.identifier] = formatted_value
+        raw_answer_map = {}
+        for identifier, question_type, answer_value in DocumentService._iter_answer_rows(db, session_id):
+            raw_answer_map[identifier] = answer_value
+            answer_map[identifier] = DocumentService._format_answer_value(answer_value, question_type)
         
         # Get template markdown content and merge using the shared _merge_template function
         # This handles all conditional logic ([[ ]], {{ IF }}, etc.) and identifier replacement
@@ -642,12 +659,6 @@ class DocumentService:
         merged_content = DocumentService._merge_template(content, answer_map)
         
         # Handle person field dot notation (e.g., <<person.field>>) for any remaining placeholders
-        identifier_pattern = r'<<([^>]+)>>'
-        
-        # Build a raw answer map (before formatting) for person JSON data
-        raw_answer_map = {}
-        for answer, question in answers_query:
-            raw_answer_map[question.identifier] = answer.answer_value
         
         # Debug: log all identifiers and their values
         print(f"DEBUG: raw_answer_map keys: {list(raw_answer_map.keys())}")
@@ -704,7 +715,8 @@ class DocumentService:
             return ''
         
         # Replace any remaining person field identifiers
-        merged_content = re.sub(identifier_pattern, replace_person_fields, merged_content)
+        if '<<' in merged_content:
+            merged_content = IDENTIFIER_PATTERN.sub(replace_person_fields, merged_content)
         
         # Create a Word document
         doc = Document()
@@ -1,6 +1,7 @@
 """Service layer for document flow operations."""
 
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, List, Tuple
 from fastapi import HTTPException, status
 
@@ -9,6 +10,16 @@ from ..models.question import QuestionGroup
 from ..schemas.flow import DocumentFlowCreate, DocumentFlowUpdate
 
 
+def _is_name_clash(error: IntegrityError) -> bool:
+    """Check whether an IntegrityError came from the ux_flow_name_active index."""
+    diag = getattr(error.orig, 'diag', None)
+    constraint_name = getattr(diag, 'constraint_name', None)
+    if constraint_name is not None:
+        return constraint_name == 'ux_flow_name_active'
+    # SQLite reports the indexed column rather than the index name
+    return 'document_flows.name' in str(error.orig)
+
+
 class FlowService:
     """Service for document flow operations."""
     
@@ -29,18 +40,6 @@ class FlowService:
         Returns:
             Created document flow
         """
-        # Check if flow name already exists
-        existing = db.query(DocumentFlow).filter(
-            DocumentFlow.name == flow_data.name,
-            DocumentFlow.is_active == True
-        ).first()
-        
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Flow with name '{flow_data.name}' already exists"
-            )
-        
         # Validate starting group if provided
         if flow_data.starting_group_id:
             starting_group = db.query(QuestionGroup).filter(
@@ -65,7 +64,18 @@ class FlowService:
         )
         
         db.add(flow)
-        db.commit()
+        
+        # Name uniqueness among active flows is enforced by ux_flow_name_active
+        try:
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if not _is_name_clash(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Flow with name '{flow_data.name}' already exists"
+            )
         db.refresh(flow)
         
         # Associate question groups if provided
@@ -118,10 +128,9 @@ class FlowService:
         Returns:
             Flow if found, None otherwise
         """
-        return db.query(DocumentFlow).filter(
-            DocumentFlow.id == flow_id,
-            DocumentFlow.is_active == True
-        ).first()
+        # Session.get() consults the identity map before issuing a SELECT
+        flow = db.get(DocumentFlow, flow_id)
+        return flow if flow and flow.is_active else None
     
     @staticmethod
     def list_flows(
@@ -179,20 +188,19 @@ class FlowService:
         
         # Update fields
         if flow_data.name is not None:
-            # Check name uniqueness
-            existing = db.query(DocumentFlow).filter(
-                DocumentFlow.name == flow_data.name,
-                DocumentFlow.id != flow_id,
-                DocumentFlow.is_active == True
-            ).first()
+            flow.name = flow_data.name
             
-            if existing:
+            # Flush now so a name clash surfaces before any other writes
+            try:
+                db.flush()
+            except IntegrityError as e:
+                db.rollback()
+                if not _is_name_clash(e):
+                    raise
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Flow with name '{flow_data.name}' already exists"
                 )
-            
-            flow.name = flow_data.name
         
         if flow_data.description is not None:
             flow.description = flow_data.description
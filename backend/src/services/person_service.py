@@ -51,7 +51,7 @@ class PersonService:
     
     def get_person(self, db: Session, person_id: int) -> Optional[Person]:
         """Get a person by ID"""
-        return db.query(Person).filter(Person.id == person_id).first()
+        return db.get(Person, person_id)
     
     def get_people(
         self,
@@ -68,6 +68,7 @@ class PersonService:
             query = query.filter(Person.is_active == 1)
         
         if search:
+            # Substring match on each column; backed by pg_trgm GIN indexes on Postgres
             search_filter = f"%{search}%"
             query = query.filter(
                 (Person.name.ilike(search_filter)) |
@@ -176,22 +177,18 @@ class PersonService:
         person_id: int
     ) -> List[dict]:
         """Get all relationships for a person"""
-        relationships = db.execute(
-            select(person_relationships).where(
-                person_relationships.c.person_id == person_id
-            )
-        ).all()
-        
-        return [
-            {
-                'person_id': rel.person_id,
-                'related_person_id': rel.related_person_id,
-                'relationship_type': rel.relationship_type,
-                'created_at': rel.created_at,
-                'updated_at': rel.updated_at
-            }
-            for rel in relationships
-        ]
+        stmt = select(
+            person_relationships.c.person_id,
+            person_relationships.c.related_person_id,
+            person_relationships.c.relationship_type,
+            person_relationships.c.created_at,
+            person_relationships.c.updated_at
+        ).where(
+            person_relationships.c.person_id == person_id
+        )
+        
+        # Build dicts straight from the result cursor rather than a fetched row list
+        return [dict(row._mapping) for row in db.execute(stmt)]
 
 
 # Singleton instance
@@ -1,5 +1,9 @@
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from sqlalchemy.orm import Session, selectinload, raiseload, load_only
+from sqlalchemy import func, delete, update, insert, select, exists, Row
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Dict, Tuple
+import threading
+import time
 from ..models.question import QuestionGroup, Question, QuestionType
 from ..schemas.question import (
     QuestionGroupCreate,
@@ -7,56 +11,221 @@ from ..schemas.question import (
     QuestionCreate,
     QuestionUpdate
 )
+from ..utils.question_logic import compile_question_logic
+from ..database import commit_keeping_loaded
 from fastapi import HTTPException, status
 
 
+class _IdentifierCache:
+    """
+    Small in-process TTL cache mapping identifiers to primary keys.
+
+    Only IDs are cached, never ORM instances, so entries are safe to share
+    across database sessions. Writes in this module evict affected entries;
+    the TTL bounds staleness from writes made by other processes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, identifier: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(identifier)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[identifier]
+                return None
+            return value
+
+    def set(self, identifier: str, value: int) -> None:
+        with self._lock:
+            if identifier not in self._entries and len(self._entries) >= self.maxsize:
+                # Evict the oldest insertion
+                del self._entries[next(iter(self._entries))]
+            self._entries[identifier] = (value, time.monotonic() + self.ttl)
+
+    def pop(self, identifier: str) -> None:
+        with self._lock:
+            self._entries.pop(identifier, None)
+
+    def pop_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# QuestionCreate fields copied onto a new Question row
+_QUESTION_CREATE_FIELDS = frozenset({
+    "question_group_id",
+    "question_text",
+    "question_type",
+    "identifier",
+    "repeatable",
+    "repeatable_group_id",
+    "display_order",
+    "is_required",
+    "help_text",
+    "options",
+    "database_table",
+    "database_value_column",
+    "database_label_column",
+    "validation_rules",
+})
+
+_group_id_cache = _IdentifierCache()
+_question_id_cache = _IdentifierCache()
+
+
 class QuestionGroupService:
     """Service for question group operations."""
 
     @staticmethod
-    def get_question_group_by_id(db: Session, group_id: int) -> Optional[QuestionGroup]:
-        """Get question group by ID."""
-        return db.query(QuestionGroup).filter(QuestionGroup.id == group_id).first()
+    def get_question_group_by_id(
+        db: Session,
+        group_id: int,
+        load_questions: bool = False
+    ) -> Optional[QuestionGroup]:
+        """Get question group by ID, optionally with its questions eager-loaded."""
+        options = [selectinload(QuestionGroup.questions)] if load_questions else None
+        return db.get(QuestionGroup, group_id, options=options)
 
     @staticmethod
     def get_question_group_by_identifier(db: Session, identifier: str) -> Optional[QuestionGroup]:
         """Get question group by identifier."""
-        return db.query(QuestionGroup).filter(QuestionGroup.identifier == identifier).first()
+        group_id = _group_id_cache.get(identifier)
+        if group_id is not None:
+            group = db.get(QuestionGroup, group_id)
+            if group is not None and group.identifier == identifier:
+                return group
+            _group_id_cache.pop(identifier)
+
+        group = db.query(QuestionGroup).filter(QuestionGroup.identifier == identifier).first()
+        if group:
+            _group_id_cache.set(identifier, group.id)
+        return group
+
+    @staticmethod
+    def get_groups_with_questions(
+        db: Session,
+        group_ids: Optional[List[int]] = None,
+        include_inactive: bool = False
+    ) -> List[QuestionGroup]:
+        """
+        Load question groups (all, or just group_ids) with their questions.
+
+        Groups and questions are fetched in two queries. The instances stay
+        in the session's identity map, so for the rest of the request
+        get_question_group_by_id returns them without SQL and
+        group.questions is already populated.
+        """
+        query = db.query(QuestionGroup).options(selectinload(QuestionGroup.questions))
+
+        if group_ids is not None:
+            if not group_ids:
+                return []
+            query = query.filter(QuestionGroup.id.in_(group_ids))
+
+        if not include_inactive:
+            query = query.filter(QuestionGroup.is_active == True)
+
+        return query.order_by(QuestionGroup.display_order, QuestionGroup.id).all()
 
     @staticmethod
     def list_question_groups(
         db: Session,
         skip: int = 0,
         limit: int = 100,
-        include_inactive: bool = False
+        include_inactive: bool = False,
+        load_questions: bool = False,
+        columns: Optional[List[str]] = None
     ) -> tuple[List[QuestionGroup], int]:
-        """List question groups with pagination."""
+        """
+        List question groups with pagination.
+
+        With load_questions, each page's questions are fetched in one extra
+        SELECT ... IN query and any other lazy load raises instead of
+        silently issuing a query per row.
+
+        With columns, only those attributes (plus the primary key) are
+        loaded. Limiting them to name, identifier, display_order and
+        is_active lets PostgreSQL answer the page from the covering
+        ix_question_groups_active_id index.
+        """
         query = db.query(QuestionGroup)
 
+        if columns:
+            query = query.options(load_only(*[getattr(QuestionGroup, c) for c in columns]))
+
+        if load_questions:
+            query = query.options(
+                selectinload(QuestionGroup.questions).raiseload('*'),
+                raiseload('*')
+            )
+
         if not include_inactive:
             query = query.filter(QuestionGroup.is_active == True)
 
         # Show newest groups first so recently created groups are immediately visible.
         query = query.order_by(QuestionGroup.id.desc())
 
-        total = query.count()
-        groups = query.offset(skip).limit(limit).all()
+        # Fetch the page and the filtered total together via a COUNT(*) OVER () window
+        rows = query.add_columns(func.count().over().label("total")).offset(skip).limit(limit).all()
+        groups = [row[0] for row in rows]
+
+        if rows:
+            total = rows[0].total
+        else:
+            # Page is past the end (or empty); only then is a separate count needed
+            total = query.count() if skip else 0
 
         return groups, total
 
+    @staticmethod
+    def list_question_group_rows(
+        db: Session,
+        columns: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        include_inactive: bool = False
+    ) -> tuple[List[Row], int]:
+        """
+        List question groups as plain rows of the given columns.
+
+        Read-only counterpart of list_question_groups for responses that are
+        serialized straight away: no ORM instances are built or tracked.
+        """
+        stmt = select(*[getattr(QuestionGroup, c) for c in columns])
+
+        if not include_inactive:
+            stmt = stmt.where(QuestionGroup.is_active == True)
+
+        stmt = stmt.order_by(QuestionGroup.id.desc())
+
+        rows = db.execute(
+            stmt.add_columns(func.count().over().label("total")).offset(skip).limit(limit)
+        ).all()
+
+        if rows:
+            total = rows[0].total
+        else:
+            total = db.scalar(
+                select(func.count()).select_from(stmt.order_by(None).subquery())
+            ) if skip else 0
+
+        return rows, total
+
     @staticmethod
     def create_question_group(db: Session, group_data: QuestionGroupCreate) -> QuestionGroup:
         """Create a new question group."""
-        # Check if identifier already exists
-        existing = db.query(QuestionGroup).filter(
-            QuestionGroup.identifier == group_data.identifier
-        ).first()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Question group with this identifier already exists"
-            )
-
         new_group = QuestionGroup(
             name=group_data.name,
             description=group_data.description,
@@ -65,8 +234,16 @@ class QuestionGroupService:
         )
 
         db.add(new_group)
-        db.commit()
-        db.refresh(new_group)
+
+        # Identifier uniqueness is enforced by the unique index on question_groups.identifier
+        try:
+            commit_keeping_loaded(db, new_group)
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Question group with this identifier already exists"
+            )
 
         return new_group
 
@@ -77,47 +254,68 @@ class QuestionGroupService:
         group_data: QuestionGroupUpdate
     ) -> QuestionGroup:
         """Update question group."""
-        group = db.query(QuestionGroup).filter(QuestionGroup.id == group_id).first()
+        group = db.get(QuestionGroup, group_id)
         if not group:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Question group not found"
             )
 
-        # Update fields
-        if group_data.name is not None:
-            group.name = group_data.name
-        if group_data.description is not None:
-            group.description = group_data.description
-        if group_data.display_order is not None:
-            group.display_order = group_data.display_order
-        if group_data.question_logic is not None:
-            group.question_logic = group_data.question_logic
-        if group_data.is_active is not None:
-            group.is_active = group_data.is_active
+        # Update fields (omitted and null fields are left unchanged)
+        update_data = group_data.model_dump(exclude_unset=True, exclude_none=True)
+        changes = {
+            field: value for field, value in update_data.items()
+            if getattr(group, field) != value
+        }
+        if not changes:
+            return group
 
-        db.commit()
-        db.refresh(group)
+        if 'question_logic' in changes:
+            changes['question_logic_compiled'] = compile_question_logic(changes['question_logic'])
+
+        # Single UPDATE ... RETURNING; the returned row repopulates the loaded instance
+        group = db.scalars(
+            update(QuestionGroup)
+            .where(QuestionGroup.id == group_id)
+            .values(**changes)
+            .returning(QuestionGroup)
+            .execution_options(synchronize_session="fetch")
+        ).one()
+        commit_keeping_loaded(db, group)
 
         return group
 
     @staticmethod
     def delete_question_group(db: Session, group_id: int) -> bool:
         """Hard delete a question group and its questions."""
-        group = db.query(QuestionGroup).filter(QuestionGroup.id == group_id).first()
-        if not group:
+        # Questions are removed by the ON DELETE CASCADE on questions.question_group_id.
+        # SQLite only honours it with PRAGMA foreign_keys enabled, so delete them explicitly there.
+        if db.get_bind().dialect.name == "sqlite":
+            db.execute(
+                delete(Question)
+                .where(Question.question_group_id == group_id)
+                .execution_options(synchronize_session="fetch")
+            )
+
+        deleted = db.execute(
+            delete(QuestionGroup)
+            .where(QuestionGroup.id == group_id)
+            .returning(QuestionGroup.id, QuestionGroup.identifier)
+            .execution_options(synchronize_session="fetch")
+        ).first()
+        if deleted is None:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Question group not found"
             )
 
-        # Delete all questions in this group first
-        db.query(Question).filter(Question.question_group_id == group_id).delete()
-
-        # Delete the group
-        db.delete(group)
         db.commit()
 
+        # Question identifiers are namespaced by the group identifier
+        _group_id_cache.pop(deleted.identifier)
+        _question_id_cache.pop_prefix(f"{deleted.identifier}.")
+
         return True
 
 
@@ -127,22 +325,62 @@ class QuestionService:
     @staticmethod
     def get_question_by_id(db: Session, question_id: int) -> Optional[Question]:
         """Get question by ID."""
-        return db.query(Question).filter(Question.id == question_id).first()
+        return db.get(Question, question_id)
 
     @staticmethod
     def get_question_by_identifier(db: Session, identifier: str) -> Optional[Question]:
         """Get question by identifier."""
-        return db.query(Question).filter(Question.identifier == identifier).first()
+        question_id = _question_id_cache.get(identifier)
+        if question_id is not None:
+            question = db.get(Question, question_id)
+            if question is not None and question.identifier == identifier:
+                return question
+            _question_id_cache.pop(identifier)
+
+        question = db.query(Question).filter(Question.identifier == identifier).first()
+        if question:
+            _question_id_cache.set(identifier, question.id)
+        return question
+
+    @staticmethod
+    def get_question_id_by_identifier(db: Session, identifier: str) -> Optional[int]:
+        """Get a question's ID by identifier, served from cache when possible."""
+        question_id = _question_id_cache.get(identifier)
+        if question_id is not None:
+            # Re-check the cached ID, which may belong to a question deleted or
+            # renamed by another worker
+            question = db.get(Question, question_id)
+            if question is not None and question.identifier == identifier:
+                return question_id
+            _question_id_cache.pop(identifier)
+
+        # Identifiers are not unique at the database level, so take the first match
+        question_id = db.query(Question.id).filter(
+            Question.identifier == identifier
+        ).limit(1).scalar()
+        if question_id is not None:
+            _question_id_cache.set(identifier, question_id)
+        return question_id
 
     @staticmethod
     def list_questions_by_group(
         db: Session,
         group_id: int,
-        include_inactive: bool = False
+        include_inactive: bool = False,
+        columns: Optional[List[str]] = None
     ) -> List[Question]:
-        """List questions for a specific group."""
+        """
+        List questions for a specific group.
+
+        With columns, only those attributes (plus the primary key) are
+        loaded; accessing any other attribute triggers a lazy load, so pass
+        it only when the caller's needs are known.
+        """
         query = db.query(Question).filter(Question.question_group_id == group_id)
 
+        if columns:
+            query = query.options(load_only(*[getattr(Question, c) for c in columns]))
+
         if not include_inactive:
             query = query.filter(Question.is_active == True)
 
@@ -150,58 +388,134 @@ class QuestionService:
 
         return query.all()
 
+    @staticmethod
+    def list_question_rows(
+        db: Session,
+        group_ids: List[int],
+        columns: List[str],
+        include_inactive: bool = False
+    ) -> List[Row]:
+        """
+        List questions of the given groups as plain rows of the given columns.
+
+        Read-only counterpart of list_questions_by_group; rows are ordered by
+        group, then display order.
+        """
+        if not group_ids:
+            return []
+
+        stmt = select(*[getattr(Question, c) for c in columns]).where(
+            Question.question_group_id.in_(group_ids)
+        )
+
+        if not include_inactive:
+            stmt = stmt.where(Question.is_active == True)
+
+        stmt = stmt.order_by(Question.question_group_id, Question.display_order)
+
+        return db.execute(stmt).all()
+
     @staticmethod
     def create_question(db: Session, question_data: QuestionCreate) -> Question:
         """Create a new question."""
-        # Verify question group exists first (needed for namespace)
-        group = db.query(QuestionGroup).filter(
-            QuestionGroup.id == question_data.question_group_id
+        # Fetch the group identifier (needed for namespace) and check whether the
+        # namespaced identifier is taken in one round trip; questions.identifier
+        # has no unique constraint, so the check is a correlated EXISTS
+        row = db.execute(
+            select(
+                QuestionGroup.identifier,
+                exists().where(
+                    Question.identifier == QuestionGroup.identifier + "." + question_data.identifier
+                ).label("duplicate")
+            ).where(QuestionGroup.id == question_data.question_group_id)
         ).first()
-        if not group:
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Question group not found"
             )
-        
-        # Build namespaced identifier and check if it already exists
-        namespaced_identifier = f"{group.identifier}.{question_data.identifier}"
-        existing = db.query(Question).filter(
-            Question.identifier == namespaced_identifier
-        ).first()
-        if existing:
+        if row.duplicate:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Question with this identifier already exists in this group"
             )
 
-        # Convert options to dict format if provided
-        options_dict = None
-        if question_data.options:
-            options_dict = [opt.model_dump() for opt in question_data.options]
-        
-        new_question = Question(
-            question_group_id=question_data.question_group_id,
-            question_text=question_data.question_text,
-            question_type=question_data.question_type,
-            identifier=namespaced_identifier,
-            repeatable=question_data.repeatable,
-            repeatable_group_id=question_data.repeatable_group_id,
-            display_order=question_data.display_order,
-            is_required=question_data.is_required,
-            help_text=question_data.help_text,
-            options=options_dict,
-            database_table=question_data.database_table,
-            database_value_column=question_data.database_value_column,
-            database_label_column=question_data.database_label_column,
-            validation_rules=question_data.validation_rules
-        )
+        namespaced_identifier = f"{row.identifier}.{question_data.identifier}"
+        new_question = Question(**QuestionService._question_values(question_data, namespaced_identifier))
         
         db.add(new_question)
-        db.commit()
-        db.refresh(new_question)
+        commit_keeping_loaded(db, new_question)
         
         return new_question
     
+    @staticmethod
+    def create_questions_bulk(
+        db: Session,
+        items: List[QuestionCreate],
+        batch_size: int = 1000
+    ) -> List[Question]:
+        """
+        Create many questions in one transaction.
+
+        Groups and existing identifiers are checked with one SELECT each, and
+        rows are written as multi-row INSERT ... RETURNING statements of at
+        most batch_size rows (keeping SQLite under its bound-parameter limit).
+        Nothing is written if any item is rejected.
+        """
+        if not items:
+            return []
+
+        group_ids = {item.question_group_id for item in items}
+        group_identifiers = dict(db.execute(
+            select(QuestionGroup.id, QuestionGroup.identifier)
+            .where(QuestionGroup.id.in_(group_ids))
+        ).all())
+        if len(group_identifiers) != len(group_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question group not found"
+            )
+
+        namespaced_identifiers = [
+            f"{group_identifiers[item.question_group_id]}.{item.identifier}"
+            for item in items
+        ]
+        duplicate = len(set(namespaced_identifiers)) != len(namespaced_identifiers) or db.scalar(
+            select(Question.id)
+            .where(Question.identifier.in_(namespaced_identifiers))
+            .limit(1)
+        ) is not None
+        if duplicate:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Question with this identifier already exists in this group"
+            )
+
+        values = [
+            QuestionService._question_values(item, identifier)
+            for item, identifier in zip(items, namespaced_identifiers)
+        ]
+        new_questions: List[Question] = []
+        for start in range(0, len(values), batch_size):
+            new_questions.extend(db.scalars(
+                insert(Question).returning(Question),
+                values[start:start + batch_size]
+            ).all())
+
+        commit_keeping_loaded(db, *new_questions)
+
+        return new_questions
+
+    @staticmethod
+    def _question_values(question_data: QuestionCreate, namespaced_identifier: str) -> dict:
+        """Column values for a new question row."""
+        # One model_dump call serializes every column, options included
+        values = question_data.model_dump(include=_QUESTION_CREATE_FIELDS)
+        values["identifier"] = namespaced_identifier
+        if not values["options"]:
+            values["options"] = None
+        return values
+
     @staticmethod
     def update_question(
         db: Session,
@@ -209,64 +523,60 @@ class QuestionService:
         question_data: QuestionUpdate
     ) -> Question:
         """Update question."""
-        question = db.query(Question).filter(Question.id == question_id).first()
+        question = db.get(Question, question_id)
         if not question:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Question not found"
             )
         
-        # Update fields
-        if question_data.question_text is not None:
-            question.question_text = question_data.question_text
-        if question_data.question_type is not None:
-            question.question_type = question_data.question_type
-        if question_data.identifier is not None:
+        # Update fields (omitted and null fields are left unchanged)
+        update_data = question_data.model_dump(exclude_unset=True, exclude_none=True)
+        if 'identifier' in update_data:
             # Build namespaced identifier using the question's group
-            group = db.query(QuestionGroup).filter(QuestionGroup.id == question.question_group_id).first()
+            group = db.get(QuestionGroup, question.question_group_id)
             if group:
-                question.identifier = f"{group.identifier}.{question_data.identifier}"
-            else:
-                question.identifier = question_data.identifier
-        if question_data.display_order is not None:
-            question.display_order = question_data.display_order
-        if question_data.is_required is not None:
-            question.is_required = question_data.is_required
-        if question_data.help_text is not None:
-            question.help_text = question_data.help_text
-        if question_data.options is not None:
-            question.options = [opt.model_dump() for opt in question_data.options]
-        if question_data.database_table is not None:
-            question.database_table = question_data.database_table
-        if question_data.database_value_column is not None:
-            question.database_value_column = question_data.database_value_column
-        if question_data.database_label_column is not None:
-            question.database_label_column = question_data.database_label_column
-        if question_data.validation_rules is not None:
-            question.validation_rules = question_data.validation_rules
-        if question_data.is_active is not None:
-            question.is_active = question_data.is_active
-        if question_data.repeatable is not None:
-            question.repeatable = question_data.repeatable
-        if question_data.repeatable_group_id is not None:
-            question.repeatable_group_id = question_data.repeatable_group_id
-        
-        db.commit()
-        db.refresh(question)
-        
+                update_data['identifier'] = f"{group.identifier}.{update_data['identifier']}"
+
+        changes = {
+            field: value for field, value in update_data.items()
+            if getattr(question, field) != value
+        }
+        if not changes:
+            return question
+
+        if 'identifier' in changes:
+            _question_id_cache.pop(question.identifier)
+
+        # Single UPDATE ... RETURNING; the returned row repopulates the loaded instance
+        question = db.scalars(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(**changes)
+            .returning(Question)
+            .execution_options(synchronize_session="fetch")
+        ).one()
+        commit_keeping_loaded(db, question)
+
         return question
     
     @staticmethod
     def delete_question(db: Session, question_id: int) -> bool:
         """Hard delete a question."""
-        question = db.query(Question).filter(Question.id == question_id).first()
-        if not question:
+        deleted = db.execute(
+            delete(Question)
+            .where(Question.id == question_id)
+            .returning(Question.identifier)
+            .execution_options(synchronize_session="fetch")
+        ).first()
+        if deleted is None:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Question not found"
             )
-        
-        db.delete(question)
+
         db.commit()
-        
+        _question_id_cache.pop(deleted.identifier)
+
         return True
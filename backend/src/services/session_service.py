@@ -1,14 +1,19 @@
 """Service layer for document session operations."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import Optional, List, Tuple, Dict, Any
 from fastapi import HTTPException, status
 from datetime import datetime
-import math
+import logging
 
 from ..models.session import InputForm, SessionAnswer
 from ..models.question import QuestionGroup, Question
 from ..models.flow import DocumentFlow, flow_question_groups
+from ..database import commit_keeping_loaded
+from ..utils.question_logic import compile_question_logic, condition_met
 from ..schemas.session import (
     InputFormCreate,
     InputFormUpdate,
@@ -17,6 +22,26 @@ from ..schemas.session import (
     SessionQuestionsResponse
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Question columns needed to build QuestionToDisplay; selected as plain rows so
+# the display path never materialises full Question instances
+_DISPLAY_COLUMNS = (
+    Question.id,
+    Question.identifier,
+    Question.question_text,
+    Question.question_type,
+    Question.is_required,
+    Question.repeatable,
+    Question.repeatable_group_id,
+    Question.help_text,
+    Question.options,
+    Question.person_display_mode,
+    Question.include_time,
+    Question.validation_rules,
+)
+
 
 class SessionService:
     """Service for document session operations."""
@@ -38,40 +63,44 @@ class SessionService:
         Returns:
             Created document session
         """
-        from ..models.flow import DocumentFlow
-
         # Determine starting group
         starting_group_id = session_data.starting_group_id
         flow_id = session_data.flow_id
 
-        # If flow is specified, use its starting group
+        # Fallback: first available group
+        first_group_query = select(QuestionGroup.id).where(
+            QuestionGroup.is_active == True
+        ).order_by(QuestionGroup.display_order).limit(1)
+
         if flow_id:
-            flow = db.query(DocumentFlow).filter(
-                DocumentFlow.id == flow_id,
-                DocumentFlow.is_active == True
+            # The flow's starting group wins, then the requested group, then the
+            # first available group, all resolved in the same query as the flow
+            row = db.execute(
+                select(func.coalesce(
+                    DocumentFlow.starting_group_id,
+                    starting_group_id,
+                    first_group_query.scalar_subquery()
+                )).where(
+                    DocumentFlow.id == flow_id,
+                    DocumentFlow.is_active == True
+                )
             ).first()
 
-            if not flow:
+            if row is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Flow not found"
                 )
+            starting_group_id = row[0]
 
-            if flow.starting_group_id:
-                starting_group_id = flow.starting_group_id
+        elif not starting_group_id:
+            starting_group_id = db.scalar(first_group_query)
 
-        # If still no starting group, get first available group
         if not starting_group_id:
-            first_group = db.query(QuestionGroup).filter(
-                QuestionGroup.is_active == True
-            ).order_by(QuestionGroup.display_order).first()
-
-            if not first_group:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No question groups available"
-                )
-            starting_group_id = first_group.id
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No question groups available"
+            )
 
         session = InputForm(
             client_identifier=session_data.client_identifier,
@@ -82,13 +111,18 @@ class SessionService:
         )
 
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        commit_keeping_loaded(db, session)
 
         return session
 
     @staticmethod
-    def get_session(db: Session, session_id: int, user_id: int) -> Optional[InputForm]:
+    def get_session(
+        db: Session,
+        session_id: int,
+        user_id: int,
+        load_flow: bool = False,
+        load_group_questions: bool = False
+    ) -> Optional[InputForm]:
         """
         Get session by ID (user can only access their own sessions).
 
@@ -96,11 +130,28 @@ class SessionService:
             db: Database session
             session_id: Session ID
             user_id: User ID
+            load_flow: Also load the session's flow and current group in the
+                same query, so later Session.get calls for them need no SQL
+            load_group_questions: Also load the current group in the same query,
+                and its questions in one more
 
         Returns:
             Session if found and belongs to user, None otherwise
         """
-        return db.query(InputForm).filter(
+        query = db.query(InputForm)
+
+        if load_flow:
+            query = query.options(
+                joinedload(InputForm.flow),
+                joinedload(InputForm.current_group)
+            )
+
+        if load_group_questions:
+            query = query.options(
+                joinedload(InputForm.current_group).selectinload(QuestionGroup.questions)
+            )
+
+        return query.filter(
             InputForm.id == session_id,
             InputForm.user_id == user_id
         ).first()
@@ -128,8 +179,17 @@ class SessionService:
             InputForm.user_id == user_id
         )
 
-        total = query.count()
-        sessions = query.order_by(InputForm.created_at.desc()).offset(skip).limit(limit).all()
+        query = query.order_by(InputForm.created_at.desc())
+
+        # Fetch the page and the total together via a COUNT(*) OVER () window
+        rows = query.add_columns(func.count().over().label("total")).offset(skip).limit(limit).all()
+        sessions = [row[0] for row in rows]
+
+        if rows:
+            total = rows[0].total
+        else:
+            # Page is past the end (or empty); only then is a separate count needed
+            total = query.count() if skip else 0
 
         return sessions, total
 
@@ -152,7 +212,9 @@ class SessionService:
         Returns:
             Updated session
         """
-        session = SessionService.get_session(db, session_id, user_id)
+        # The current group comes back with the session; _get_next_group reads
+        # its questions, so they are loaded up front too
+        session = SessionService.get_session(db, session_id, user_id, load_group_questions=True)
         if not session:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -161,10 +223,7 @@ class SessionService:
 
         # Allow saving answers on completed sessions for editing
 
-        # Get current group
-        current_group = db.query(QuestionGroup).filter(
-            QuestionGroup.id == session.current_group_id
-        ).first()
+        current_group = session.current_group
 
         if not current_group:
             raise HTTPException(
@@ -172,27 +231,8 @@ class SessionService:
                 detail="Current question group not found"
             )
 
-        # Save answers
-        for answer_data in answers:
-            # Check if answer already exists for this question
-            existing_answer = db.query(SessionAnswer).filter(
-                SessionAnswer.session_id == session_id,
-                SessionAnswer.question_id == answer_data.question_id
-            ).first()
-
-            if existing_answer:
-                # Update existing answer
-                existing_answer.answer_value = answer_data.answer_value
-            else:
-                # Create new answer
-                answer = SessionAnswer(
-                    session_id=session_id,
-                    question_id=answer_data.question_id,
-                    answer_value=answer_data.answer_value
-                )
-                db.add(answer)
-
-        db.commit()
+        # Save answers; committed together with the navigation below
+        SessionService._upsert_answers(db, session_id, answers)
 
         # Determine next group based on conditional flow
         next_group_id = SessionService._get_next_group(db, session, current_group, answers)
@@ -204,11 +244,56 @@ class SessionService:
             session.is_completed = True
             session.completed_at = datetime.utcnow()
 
-        db.commit()
-        db.refresh(session)
+        commit_keeping_loaded(db, session)
 
         return session
 
+    @staticmethod
+    def _upsert_answers(
+        db: Session,
+        session_id: int,
+        answers: List[SessionAnswerCreate]
+    ) -> None:
+        """
+        Insert or update answers for a session in one batched statement.
+
+        Uses INSERT ... ON CONFLICT (session_id, question_id) DO UPDATE, which
+        PostgreSQL and SQLite both support. If a question is answered more
+        than once in the batch, the last answer wins.
+
+        Args:
+            db: Database session
+            session_id: Session ID
+            answers: Answers to save
+        """
+        values = {
+            answer_data.question_id: {
+                "session_id": session_id,
+                "question_id": answer_data.question_id,
+                "answer_value": answer_data.answer_value
+            }
+            for answer_data in answers
+        }
+        if not values:
+            return
+
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = postgresql_insert(SessionAnswer)
+        else:
+            stmt = sqlite_insert(SessionAnswer)
+
+        # Executed with a parameter list rather than .values([...]) so the SQL text
+        # does not vary with the number of answers: it stays in the compiled cache
+        # and the driver batches the rows (insertmanyvalues / execute_values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["session_id", "question_id"],
+            set_={
+                "answer_value": stmt.excluded.answer_value,
+                "updated_at": datetime.utcnow()
+            }
+        )
+        db.execute(stmt, list(values.values()))
+
     @staticmethod
     def _get_next_group(
         db: Session,
@@ -233,6 +318,14 @@ class SessionService:
 
         # Check if current group has question logic with conditionals
         if current_group.question_logic:
+            # Index questions by both full identifier and stripped version (without
+            # namespace prefix); the first question in display order wins, as before
+            question_by_identifier = {}
+            for q in current_group.questions:
+                question_by_identifier.setdefault(q.identifier, q)
+                if '.' in q.identifier:
+                    question_by_identifier.setdefault(q.identifier.split('.', 1)[1], q)
+
             for item in current_group.question_logic:
                 if item.get('type') == 'conditional':
                     cond = item.get('conditional', {})
@@ -242,50 +335,17 @@ class SessionService:
                     next_group_id = cond.get('nextGroupId')
 
                     # Find question by identifier to get its ID
-                    # Support both namespaced and non-namespaced identifiers
-                    for q in current_group.questions:
-                        # Check both full identifier and stripped version
-                        q_stripped = q.identifier.split('.', 1)[1] if '.' in q.identifier else q.identifier
-                        if q.identifier == if_identifier or q_stripped == if_identifier:
-                            actual_value = answer_by_question_id.get(q.id)
-
-                            # Skip if the field is empty
-                            if actual_value is None or actual_value == '':
-                                break
-
-                            # Evaluate based on operator
-                            if operator == 'not_equals':
-                                condition_met = actual_value != expected_value
-                            elif operator in ('count_greater_than', 'count_equals', 'count_less_than'):
-                                # Count operators for repeatable fields - parse JSON array and compare length
-                                try:
-                                    import json
-                                    parsed = json.loads(actual_value)
-                                    if isinstance(parsed, list):
-                                        count = len(parsed)
-                                    else:
-                                        count = 1  # Non-array value counts as 1
-                                except (json.JSONDecodeError, TypeError):
-                                    count = 1 if actual_value else 0  # Non-JSON value counts as 1 if not empty
-                                
-                                try:
-                                    threshold = int(expected_value)
-                                except (ValueError, TypeError):
-                                    threshold = 0
-                                
-                                if operator == 'count_greater_than':
-                                    condition_met = count > threshold
-                                elif operator == 'count_equals':
-                                    condition_met = count == threshold
-                                else:  # count_less_than
-                                    condition_met = count < threshold
-                            else:  # 'equals' or default
-                                condition_met = actual_value == expected_value
-
-                            if condition_met:
-                                if next_group_id:
-                                    return next_group_id
-                                break
+                    q = question_by_identifier.get(if_identifier)
+                    if q is None:
+                        continue
+                    actual_value = answer_by_question_id.get(q.id)
+
+                    # Skip if the field is empty
+                    if actual_value is None or actual_value == '':
+                        continue
+
+                    if condition_met(actual_value, operator, expected_value) and next_group_id:
+                        return next_group_id
 
         # If no conditional flow matched, find next group by display_order
         next_group = db.query(QuestionGroup).filter(
@@ -365,7 +425,7 @@ class SessionService:
         Returns:
             SessionQuestionsResponse with questions and navigation info
         """
-        session = SessionService.get_session(db, session_id, user_id)
+        session = SessionService.get_session(db, session_id, user_id, load_flow=True)
         if not session:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -379,23 +439,25 @@ class SessionService:
         flow_name = None
         ordered_groups = []
 
+        # Existing answers are read once and shared by the flow and question logic
+        answer_rows = SessionService._get_answer_rows(db, session_id)
+        existing_answers = {question_id: value for question_id, _, value in answer_rows}
+        answered_identifiers = {question_id: identifier for question_id, identifier, _ in answer_rows}
+
         if session.flow_id:
-            flow = db.query(DocumentFlow).filter(
-                DocumentFlow.id == session.flow_id
-            ).first()
+            flow = db.get(DocumentFlow, session.flow_id)
             if flow:
                 flow_name = flow.name
                 # Get groups from flow_logic
                 if flow.flow_logic:
                     ordered_groups = SessionService._get_groups_from_flow_logic(
-                        db, flow.flow_logic, session_id
+                        db, flow.flow_logic, session_id,
+                        answer_map={identifier: value for _, identifier, value in answer_rows}
                     )
 
         # If no flow or no groups from flow_logic, use current_group_id
         if not ordered_groups and session.current_group_id:
-            group = db.query(QuestionGroup).filter(
-                QuestionGroup.id == session.current_group_id
-            ).first()
+            group = db.get(QuestionGroup, session.current_group_id)
             if group:
                 ordered_groups = [group]
 
@@ -406,80 +468,58 @@ class SessionService:
             )
 
         # Find current group index
-        current_group_index = 0
-        current_group = None
-        for i, group in enumerate(ordered_groups):
-            if group.id == session.current_group_id:
-                current_group_index = i
-                current_group = group
-                break
-
-        if not current_group:
+        current_group_index = SessionService._group_index(ordered_groups, session.current_group_id)
+        if current_group_index is not None:
+            current_group = ordered_groups[current_group_index]
+        else:
             current_group = ordered_groups[0]
             current_group_index = 0
             # Update session's current_group_id
             session.current_group_id = current_group.id
             db.commit()
 
-        # Get existing answers for this session
-        existing_answers_list = db.query(SessionAnswer).filter(
-            SessionAnswer.session_id == session_id
-        ).all()
-        existing_answers = {a.question_id: a.answer_value for a in existing_answers_list}
+        if current_group.question_logic:
+            # Get questions to display based on question_logic as (question, depth)
+            # tuples; the same pass collects the identifiers conditionals depend on
+            questions_with_depth, conditional_identifiers = SessionService._get_questions_from_logic(
+                db, current_group, existing_answers, answered_identifiers
+            )
 
-        # Get questions to display based on question_logic
-        # Returns list of (question, depth) tuples
-        questions_with_depth = SessionService._get_questions_from_logic(
-            db, current_group, existing_answers
-        )
+            # Paginate questions
+            total_questions = len(questions_with_depth)
+            total_pages = max(1, (total_questions + questions_per_page - 1) // questions_per_page)
+            page = max(1, min(page, total_pages))
+
+            start_idx = (page - 1) * questions_per_page
+            end_idx = start_idx + questions_per_page
+            paginated_questions = questions_with_depth[start_idx:end_idx]
+        else:
+            conditional_identifiers = set()
+            # Without logic every active question is shown in order, so only the page is loaded
+            page = max(1, page)
+            paginated_questions, total_questions = SessionService._get_question_page(
+                db, current_group.id, page, questions_per_page
+            )
+            total_pages = max(1, (total_questions + questions_per_page - 1) // questions_per_page)
+            if page > total_pages:
+                page = total_pages
+                paginated_questions, _ = SessionService._get_question_page(
+                    db, current_group.id, page, questions_per_page
+                )
 
-        # Paginate questions
-        total_questions = len(questions_with_depth)
-        total_pages = max(1, math.ceil(total_questions / questions_per_page))
-        page = max(1, min(page, total_pages))
-
-        start_idx = (page - 1) * questions_per_page
-        end_idx = start_idx + questions_per_page
-        paginated_questions = questions_with_depth[start_idx:end_idx]
-
-        # Convert to response format
-        question_responses = []
-        for q, depth in paginated_questions:
-            question_responses.append(QuestionToDisplay(
-                id=q.id,
-                identifier=q.identifier,
-                question_text=q.question_text,
-                question_type=q.question_type,
-                is_required=q.is_required,
-                repeatable=q.repeatable,
-                repeatable_group_id=q.repeatable_group_id,
-                help_text=q.help_text,
-                options=q.options,
-                person_display_mode=q.person_display_mode,
-                include_time=q.include_time,
-                validation_rules=q.validation_rules,
+        # Convert to response format; rows come straight from the database, so
+        # the per-field validation of QuestionToDisplay is skipped
+        question_responses = [
+            QuestionToDisplay.model_construct(
+                **q._mapping,
                 current_answer=existing_answers.get(q.id),
                 depth=depth
-            ))
+            )
+            for q, depth in paginated_questions
+        ]
 
         is_last_group = current_group_index >= len(ordered_groups) - 1
 
-        # Extract identifiers that have conditionals depending on them
-        conditional_identifiers = []
-        if current_group.question_logic:
-            def extract_conditional_identifiers(items):
-                identifiers = []
-                for item in items:
-                    if item.get('type') == 'conditional' and item.get('conditional'):
-                        cond = item['conditional']
-                        if_identifier = cond.get('ifIdentifier')
-                        if if_identifier:
-                            identifiers.append(if_identifier)
-                        # Check nested items recursively
-                        if cond.get('nestedItems'):
-                            identifiers.extend(extract_conditional_identifiers(cond['nestedItems']))
-                return identifiers
-            conditional_identifiers = list(set(extract_conditional_identifiers(current_group.question_logic)))
 
         return SessionQuestionsResponse(
             session_id=session_id,
@@ -498,40 +538,109 @@ class SessionService:
             is_last_group=is_last_group,
             can_go_back=current_group_index > 0 or page > 1,
             existing_answers=existing_answers,
-            conditional_identifiers=conditional_identifiers
+            conditional_identifiers=list(conditional_identifiers)
         )
 
+    @staticmethod
+    def _group_index(groups: List[QuestionGroup], group_id: Optional[int]) -> Optional[int]:
+        """
+        Get the position of a group in an ordered list of groups, or None if absent.
+        """
+        return next((i for i, group in enumerate(groups) if group.id == group_id), None)
+
+    @staticmethod
+    def _get_question_page(
+        db: Session,
+        group_id: int,
+        page: int,
+        questions_per_page: int
+    ) -> Tuple[List[Tuple[Row, int]], int]:
+        """
+        Get one page of a group's active questions, in display order, at depth 0.
+
+        Returns:
+            Tuple of ((question row, depth) list, total active questions in the group)
+        """
+        rows = db.query(*_DISPLAY_COLUMNS, func.count().over().label("total")).filter(
+            Question.question_group_id == group_id,
+            Question.is_active == True
+        ).order_by(Question.display_order).offset(
+            (page - 1) * questions_per_page
+        ).limit(questions_per_page).all()
+
+        if rows:
+            total = rows[0].total
+        else:
+            total = db.query(func.count(Question.id)).filter(
+                Question.question_group_id == group_id,
+                Question.is_active == True
+            ).scalar() if page > 1 else 0
+
+        return [(row, 0) for row in rows], total
+
+    @staticmethod
+    def _get_answer_rows(db: Session, session_id: int) -> List[Tuple[int, str, str]]:
+        """
+        Get (question_id, question identifier, answer value) for every answer in a session.
+        """
+        return db.query(Question.id, Question.identifier, SessionAnswer.answer_value).join(
+            SessionAnswer, SessionAnswer.question_id == Question.id
+        ).filter(
+            SessionAnswer.session_id == session_id
+        ).all()
+
     @staticmethod
     def _get_groups_from_flow_logic(
         db: Session,
         flow_logic: List[Dict],
-        session_id: int
+        session_id: int,
+        answer_map: Optional[Dict[str, str]] = None
     ) -> List[QuestionGroup]:
         """
         Extract ordered list of question groups from flow_logic.
-        Evaluates conditionals based on existing answers.
+        Evaluates conditionals based on existing answers, keyed by question
+        identifier; they are loaded unless the caller passes answer_map.
         """
+        if answer_map is None:
+            answer_map = {
+                identifier: value
+                for _, identifier, value in SessionService._get_answer_rows(db, session_id)
+            }
+
+        # Load every group the flow can reach in one query
+        def collect_group_ids(steps: List[Dict]):
+            for step in steps:
+                if step.get('type') == 'group' and step.get('groupId'):
+                    yield step['groupId']
+                elif step.get('type') == 'conditional' and step.get('conditional'):
+                    cond = step['conditional']
+                    if cond.get('targetGroupId'):
+                        yield cond['targetGroupId']
+                    if cond.get('nestedSteps'):
+                        yield from collect_group_ids(cond['nestedSteps'])
+
+        group_ids = set(collect_group_ids(flow_logic))
+        groups_by_id = {
+            group.id: group
+            for group in db.query(QuestionGroup).filter(
+                QuestionGroup.id.in_(group_ids),
+                QuestionGroup.is_active == True
+            )
+        } if group_ids else {}
+
         groups = []
+        added_group_ids = set()
 
-        # Get existing answers for conditional evaluation
-        existing_answers = db.query(SessionAnswer).filter(
-            SessionAnswer.session_id == session_id
-        ).all()
-        answer_map = {}
-        for answer in existing_answers:
-            question = db.query(Question).filter(Question.id == answer.question_id).first()
-            if question:
-                answer_map[question.identifier] = answer.answer_value
+        def add_group(group_id):
+            group = groups_by_id.get(group_id)
+            if group and group.id not in added_group_ids:
+                groups.append(group)
+                added_group_ids.add(group.id)
 
         def process_steps(steps: List[Dict]):
             for step in steps:
                 if step.get('type') == 'group' and step.get('groupId'):
-                    group = db.query(QuestionGroup).filter(
-                        QuestionGroup.id == step['groupId'],
-                        QuestionGroup.is_active == True
-                    ).first()
-                    if group and group not in groups:
-                        groups.append(group)
+                    add_group(step['groupId'])
 
                 elif step.get('type') == 'conditional' and step.get('conditional'):
                     cond = step['conditional']
@@ -544,12 +653,7 @@ class SessionService:
                             # Condition met - add target group
                             target_group_id = cond.get('targetGroupId')
                             if target_group_id:
-                                target_group = db.query(QuestionGroup).filter(
-                                    QuestionGroup.id == target_group_id,
-                                    QuestionGroup.is_active == True
-                                ).first()
-                                if target_group and target_group not in groups:
-                                    groups.append(target_group)
+                                add_group(target_group_id)
 
                             # Process nested steps
                             if cond.get('nestedSteps'):
@@ -562,148 +666,114 @@ class SessionService:
     def _get_questions_from_logic(
         db: Session,
         group: QuestionGroup,
-        existing_answers: Dict[int, str]
-    ) -> List[Question]:
+        existing_answers: Dict[int, str],
+        answered_identifiers: Optional[Dict[int, str]] = None
+    ) -> Tuple[List[Tuple[Row, int]], set]:
         """
         Get questions to display based on question_logic.
-        Evaluates conditionals and respects stop flags.
-        """
-        import logging
-        logger = logging.getLogger(__name__)
+        Evaluates conditionals and respects stop flags. answered_identifiers
+        maps answered question IDs to identifiers; it is loaded if not given.
 
-        logger.info(f"_get_questions_from_logic called for group {group.id} ({group.name})")
-        logger.info(f"question_logic: {group.question_logic}")
-        logger.info(f"existing_answers: {existing_answers}")
+        Returns:
+            Tuple of ((question row, depth) list, identifiers referenced by any conditional)
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        logger.debug("_get_questions_from_logic called for group %s (%s)", group.id, group.name)
+        logger.debug("question_logic: %s", group.question_logic)
+        logger.debug("existing_answers: %s", existing_answers)
 
         if not group.question_logic:
             # No logic defined - return all questions in order with depth 0
-            logger.info("No question_logic defined, returning all questions")
-            questions = db.query(Question).filter(
+            logger.debug("No question_logic defined, returning all questions")
+            questions = db.query(*_DISPLAY_COLUMNS).filter(
                 Question.question_group_id == group.id,
                 Question.is_active == True
             ).order_by(Question.display_order).all()
-            return [(q, 0) for q in questions]
+            return [(q, 0) for q in questions], set()
 
-        questions_with_depth = []  # List of (question, depth) tuples
+        questions_with_depth = []  # List of (question row, depth) tuples
         question_ids_added = set()  # Track which question IDs have been added
         # Build answer map by identifier
         # Store both namespaced and non-namespaced versions for compatibility
         answer_by_identifier = {}
-        for q_id, answer in existing_answers.items():
-            question = db.query(Question).filter(Question.id == q_id).first()
-            if question:
-                # Store with full namespaced identifier
-                answer_by_identifier[question.identifier] = answer
-                # Also store with stripped identifier (without namespace prefix)
-                if '.' in question.identifier:
-                    stripped_identifier = question.identifier.split('.', 1)[1]
-                    answer_by_identifier[stripped_identifier] = answer
-
-        logger.info(f"answer_by_identifier: {answer_by_identifier}")
-
-        def process_logic_items(items: List[Dict], depth: int = 0) -> bool:
-            """Process logic items. Returns False if stop flag encountered."""
-            indent = "  " * depth
-            logger.info(f"{indent}Processing {len(items)} logic items at depth {depth}")
-
-            for idx, item in enumerate(items):
-                logger.info(f"{indent}Item {idx}: type={item.get('type')}, questionId={item.get('questionId')}")
-
-                if item.get('type') == 'question':
-                    question_id = item.get('questionId')
-                    if question_id:
-                        question = db.query(Question).filter(
-                            Question.id == question_id,
-                            Question.is_active == True
-                        ).first()
-                        if question and question.id not in question_ids_added:
-                            logger.info(f"{indent}  Adding question: {question.identifier} (id={question.id}, depth={depth})")
-                            questions_with_depth.append((question, depth))
-                            question_ids_added.add(question.id)
-                        elif not question:
-                            logger.warning(f"{indent}  Question with id {question_id} not found or inactive")
-                    else:
-                        logger.warning(f"{indent}  Question item has no questionId")
-
-                    # Check for stop flag
-                    if item.get('stopFlow'):
-                        logger.info(f"{indent}  Stop flag encountered")
-                        return False
-
-                elif item.get('type') == 'conditional' and item.get('conditional'):
-                    cond = item['conditional']
-                    identifier = cond.get('ifIdentifier')
-                    expected_value = cond.get('value')
-                    operator = cond.get('operator', 'equals')  # Default to 'equals' for backwards compatibility
+        if answered_identifiers is None:
+            answered_identifiers = dict(
+                db.query(Question.id, Question.identifier).filter(
+                    Question.id.in_(existing_answers.keys())
+                ).all()
+            ) if existing_answers else {}
+        for q_id, q_identifier in answered_identifiers.items():
+            answer = existing_answers[q_id]
+            # Store with full namespaced identifier
+            answer_by_identifier[q_identifier] = answer
+            # Also store with stripped identifier (without namespace prefix)
+            if '.' in q_identifier:
+                stripped_identifier = q_identifier.split('.', 1)[1]
+                answer_by_identifier[stripped_identifier] = answer
+
+        # The logic is compiled to a flat plan when the group is saved; groups
+        # saved before that was introduced are compiled here
+        plan = group.question_logic_compiled or compile_question_logic(group.question_logic)
+
+        # Load every active question the plan references in one query, and note which
+        # identifiers conditionals depend on (whether or not they are reached)
+        referenced_ids = set()
+        conditional_identifiers = set()
+        for op in plan:
+            if op[0] == "Q" and op[1]:
+                referenced_ids.add(op[1])
+            elif op[0] == "COND" and op[1]:
+                conditional_identifiers.add(op[1])
+        questions_by_id = {
+            q.id: q
+            for q in db.query(*_DISPLAY_COLUMNS).filter(
+                Question.id.in_(referenced_ids),
+                Question.is_active == True
+            )
+        } if referenced_ids else {}
+
+        logger.debug("answer_by_identifier: %s", answer_by_identifier)
+
+        pc = 0
+        while pc < len(plan):
+            op = plan[pc]
+
+            if op[0] == "Q":
+                _, question_id, depth, stop_flow = op
+                if question_id:
+                    question = questions_by_id.get(question_id)
+                    if question and question.id not in question_ids_added:
+                        logger.debug("Adding question: %s (id=%s, depth=%d)", question.identifier, question.id, depth)
+                        questions_with_depth.append((question, depth))
+                        question_ids_added.add(question.id)
+                    elif not question:
+                        logger.warning("Question with id %s not found or inactive", question_id)
+                else:
+                    logger.warning("Question item has no questionId")
+
+                if stop_flow:
+                    logger.debug("Stop flag encountered")
+                    break
+
+            elif op[0] == "COND":
+                _, identifier, operator, expected_value, skip_to = op
+                # Don't show conditional questions if the referenced field is empty
+                actual_value = answer_by_identifier.get(identifier) if identifier else None
+                if actual_value is None or actual_value == '' or not condition_met(actual_value, operator, expected_value):
+                    logger.debug("Condition NOT MET: %s %s '%s' (answer: '%s')", identifier, operator, expected_value, actual_value)
+                    pc = skip_to
+                    continue
+                logger.debug("Condition MET: %s %s '%s'", identifier, operator, expected_value)
+
+            elif op[1]:  # END of a met conditional with endFlow
+                logger.debug("End flow flag encountered")
+                break
 
-                    operator_display = '==' if operator == 'equals' else '!='
-                    logger.info(f"{indent}  Conditional: if {identifier} {operator_display} '{expected_value}'")
-                    logger.info(f"{indent}  Current answer for {identifier}: '{answer_by_identifier.get(identifier, 'NOT ANSWERED')}'")
+            pc += 1
 
-                    # Check if condition is met
-                    # Don't show conditional questions if the referenced field is empty
-                    if identifier and identifier in answer_by_identifier:
-                        actual_value = answer_by_identifier[identifier]
-
-                        # If the actual value is empty/None, don't show conditional questions
-                        if actual_value is None or actual_value == '':
-                            logger.info(f"{indent}  Condition NOT MET (field is empty)")
-                            continue
-
-                        # Evaluate based on operator
-                        if operator == 'not_equals':
-                            condition_met = actual_value != expected_value
-                        elif operator in ('count_greater_than', 'count_equals', 'count_less_than'):
-                            # Count operators for repeatable fields - parse JSON array and compare length
-                            try:
-                                import json
-                                parsed = json.loads(actual_value)
-                                if isinstance(parsed, list):
-                                    count = len(parsed)
-                                else:
-                                    count = 1  # Non-array value counts as 1
-                            except (json.JSONDecodeError, TypeError):
-                                count = 1 if actual_value else 0  # Non-JSON value counts as 1 if not empty
-                            
-                            try:
-                                threshold = int(expected_value)
-                            except (ValueError, TypeError):
-                                threshold = 0
-                            
-                            if operator == 'count_greater_than':
-                                condition_met = count > threshold
-                            elif operator == 'count_equals':
-                                condition_met = count == threshold
-                            else:  # count_less_than
-                                condition_met = count < threshold
-                            
-                            logger.info(f"{indent}  Count comparison: {count} {operator} {threshold} = {condition_met}")
-                        else:  # 'equals' or default
-                            condition_met = actual_value == expected_value
-                        
-                        if condition_met:
-                            logger.info(f"{indent}  Condition MET - processing nested items")
-                            # Condition met - process nested items
-                            nested_items = cond.get('nestedItems', [])
-                            if nested_items:
-                                should_continue = process_logic_items(nested_items, depth + 1)
-                                if not should_continue:
-                                    return False
-                            
-                            # Check for end flow flag
-                            if cond.get('endFlow'):
-                                logger.info(f"{indent}  End flow flag encountered")
-                                return False
-                        else:
-                            logger.info(f"{indent}  Condition NOT MET (value mismatch)")
-                    else:
-                        logger.info(f"{indent}  Condition NOT MET (identifier not in answers)")
-            
-            return True
-        
-        process_logic_items(group.question_logic)
-        logger.info(f"Final questions to display: {[(q.identifier, d) for q, d in questions_with_depth]}")
-        return questions_with_depth
+        if debug:
+            logger.debug("Final questions to display: %s", [(q.identifier, d) for q, d in questions_with_depth])
+        return questions_with_depth, conditional_identifiers
     
     @staticmethod
     def save_answers(
@@ -722,22 +792,7 @@ class SessionService:
                 detail="Session not found"
             )
         
-        for answer_data in answers:
-            existing = db.query(SessionAnswer).filter(
-                SessionAnswer.session_id == session_id,
-                SessionAnswer.question_id == answer_data.question_id
-            ).first()
-            
-            if existing:
-                existing.answer_value = answer_data.answer_value
-            else:
-                answer = SessionAnswer(
-                    session_id=session_id,
-                    question_id=answer_data.question_id,
-                    answer_value=answer_data.answer_value
-                )
-                db.add(answer)
-        
+        SessionService._upsert_answers(db, session_id, answers)
         db.commit()
     
     @staticmethod
@@ -761,7 +816,7 @@ class SessionService:
         Returns:
             Updated session
         """
-        session = SessionService.get_session(db, session_id, user_id)
+        session = SessionService.get_session(db, session_id, user_id, load_flow=True)
         if not session:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -770,34 +825,27 @@ class SessionService:
         
         # Allow navigation and saving on completed sessions for editing
         
-        # Save answers if provided
+        # Save answers if provided; they are committed with the navigation below,
+        # which keeps the flow and group loaded above from being expired
         if answers:
-            SessionService.save_answers(db, session_id, user_id, answers)
+            SessionService._upsert_answers(db, session_id, answers)
         
         # Get ordered groups from flow
         ordered_groups = []
         if session.flow_id:
-            flow = db.query(DocumentFlow).filter(
-                DocumentFlow.id == session.flow_id
-            ).first()
+            flow = db.get(DocumentFlow, session.flow_id)
             if flow and flow.flow_logic:
                 ordered_groups = SessionService._get_groups_from_flow_logic(
                     db, flow.flow_logic, session_id
                 )
         
         if not ordered_groups and session.current_group_id:
-            group = db.query(QuestionGroup).filter(
-                QuestionGroup.id == session.current_group_id
-            ).first()
+            group = db.get(QuestionGroup, session.current_group_id)
             if group:
                 ordered_groups = [group]
         
         # Find current index
-        current_index = 0
-        for i, group in enumerate(ordered_groups):
-            if group.id == session.current_group_id:
-                current_index = i
-                break
+        current_index = SessionService._group_index(ordered_groups, session.current_group_id) or 0
         
         # Navigate
         if direction == 'forward':
@@ -813,8 +861,7 @@ class SessionService:
             if current_index > 0:
                 session.current_group_id = ordered_groups[current_index - 1].id
         
-        db.commit()
-        db.refresh(session)
+        commit_keeping_loaded(db, session)
         
         return session
     
@@ -835,14 +882,11 @@ class SessionService:
         if not session:
             return None
         
-        # Get all answers for this session with their question identifiers
-        answers = db.query(SessionAnswer, Question.identifier).join(
-            Question, SessionAnswer.question_id == Question.id
+        # Distinct, sorted identifiers of the questions answered in this session
+        rows = db.query(Question.identifier).join(
+            SessionAnswer, SessionAnswer.question_id == Question.id
         ).filter(
             SessionAnswer.session_id == session_id
-        ).all()
-        
-        # Extract unique identifiers
-        identifiers = list(set([identifier for _, identifier in answers]))
+        ).distinct().order_by(Question.identifier).all()
         
-        return sorted(identifiers)
+        return [identifier for identifier, in rows]
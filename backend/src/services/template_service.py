@@ -1,13 +1,20 @@
 """Service layer for template operations."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import func
 from typing import Optional
 from fastapi import HTTPException, status, UploadFile
 from ..models.template import Template, TemplateType
 from ..schemas.template import TemplateCreate, TemplateUpdate
 from ..utils.document_processor import DocumentProcessor
 from ..config import settings
+import asyncio
 import os
+from pathlib import Path
+
+
+# Uploads are stored relative to the estate_docs root (the parent of backend/)
+UPLOAD_DIR = Path(__file__).parent.parent.parent.parent / settings.upload_dir.lstrip('./')
 
 
 class TemplateService:
@@ -56,19 +63,18 @@ class TemplateService:
     @staticmethod
     def get_template(db: Session, template_id: int) -> Optional[Template]:
         """
-        Get template by ID.
+        Get template by ID via the identity map, so a template already loaded
+        in this database session is returned without a query.
         
         Args:
             db: Database session
             template_id: Template ID
             
         Returns:
-            Template if found, None otherwise
+            Template if found and active, None otherwise
         """
-        return db.query(Template).filter(
-            Template.id == template_id,
-            Template.is_active == True
-        ).first()
+        template = db.get(Template, template_id)
+        return template if template and template.is_active else None
     
     @staticmethod
     def list_templates(
@@ -78,7 +84,8 @@ class TemplateService:
         search: Optional[str] = None
     ) -> tuple[list[Template], int]:
         """
-        List templates with pagination and search.
+        List templates with pagination and search. The markdown content is
+        not loaded; listings only show template metadata.
         
         Args:
             db: Database session
@@ -89,13 +96,25 @@ class TemplateService:
         Returns:
             Tuple of (templates list, total count)
         """
-        query = db.query(Template).filter(Template.is_active == True)
+        query = db.query(Template).options(defer(Template.markdown_content)).filter(
+            Template.is_active == True
+        )
         
         if search:
+            # Substring match; backed by a pg_trgm GIN index on Postgres
             query = query.filter(Template.name.ilike(f"%{search}%"))
         
-        total = query.count()
-        templates = query.order_by(Template.created_at.desc()).offset(skip).limit(limit).all()
+        # Fetch the page and the total together via a COUNT(*) OVER () window
+        rows = query.order_by(Template.created_at.desc()).add_columns(
+            func.count().over().label("total")
+        ).offset(skip).limit(limit).all()
+        templates = [row[0] for row in rows]
+        
+        if rows:
+            total = rows[0].total
+        else:
+            # Page is past the end (or empty); only then is a separate count needed
+            total = query.count() if skip else 0
         
         return templates, total
     
@@ -120,7 +139,15 @@ class TemplateService:
         if not template:
             return None
         
-        update_data = template_data.model_dump(exclude_unset=True)
+        # Only fields that actually change are written; an unchanged save
+        # (e.g. autosave) skips validation, identifier extraction and the UPDATE
+        update_data = {
+            field: value
+            for field, value in template_data.model_dump(exclude_unset=True).items()
+            if getattr(template, field) != value
+        }
+        if not update_data:
+            return template
         
         # Validate markdown if being updated
         if 'markdown_content' in update_data:
@@ -194,50 +221,35 @@ class TemplateService:
                 detail="Unsupported file type. Supported: .docx, .pdf, .txt, .jpg, .png, .tiff"
             )
 
-        # Read file content
-        content = await file.read()
-        logging.info(f"Read {len(content)} bytes from file")
-
-        # Save file to temp storage - resolve path relative to estate_docs root
-        from pathlib import Path
-        backend_root = Path(__file__).parent.parent.parent  # backend/
-        estate_docs_root = backend_root.parent  # estate_docs/
-        upload_dir = estate_docs_root / settings.upload_dir.lstrip('./')
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        file_path = DocumentProcessor.save_uploaded_file(content, file.filename, str(upload_dir))
+        # Save file to temp storage (created at startup)
+        # Stream the spooled upload to disk in chunks instead of reading it into memory
+        await file.seek(0)
+        file_path = await asyncio.to_thread(
+            DocumentProcessor.save_uploaded_file, file.file, file.filename, str(UPLOAD_DIR)
+        )
+        logging.info(f"Wrote {os.path.getsize(file_path)} bytes from file")
 
         # Convert to markdown based on file type
         logging.info(f"Saved file to: {file_path}")
         try:
-            if file_type == 'word':
-                markdown_content = DocumentProcessor.word_to_markdown(file_path)
-            elif file_type == 'pdf':
-                logging.info(f"Converting PDF to markdown: {file_path}")
-                markdown_content = DocumentProcessor.pdf_to_markdown(file_path)
-                logging.info(f"PDF conversion result length: {len(markdown_content) if markdown_content else 0}")
-            elif file_type == 'text':
-                markdown_content = DocumentProcessor.text_to_markdown(file_path)
-            elif file_type == 'image':
-                # Use OpenAI Vision API for OCR
-                markdown_content = DocumentProcessor.ocr_image_with_openai(file_path)
-                if not markdown_content:
-                    markdown_content = "# OCR Processing Failed\n\nCould not extract text from this image. Please check your OpenAI API key configuration."
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Unsupported file type"
-                )
+            # Conversion parses the whole file (or waits on OCR), so it runs in a
+            # worker thread to keep the event loop serving other requests
+            markdown_content = await asyncio.to_thread(
+                TemplateService._convert_to_markdown, file_type, file_path
+            )
 
             # Save markdown file to document_uploads if Word, PDF, or Text
             markdown_file_path = None
             if file_type in ['word', 'pdf', 'text'] and db and template_name:
                 # Get username from database
                 from ..models.user import User
-                user = db.query(User).filter(User.id == created_by).first()
-                username = user.username if user else f"user_{created_by}"
+                username = db.query(User.username).filter(
+                    User.id == created_by
+                ).scalar() or f"user_{created_by}"
 
-                # Save markdown file
-                markdown_file_path = DocumentProcessor.save_markdown_file(
+                # Save markdown file (in a worker thread, like the upload itself)
+                markdown_file_path = await asyncio.to_thread(
+                    DocumentProcessor.save_markdown_file,
                     markdown_content,
                     template_name,
                     username
@@ -260,6 +272,40 @@ class TemplateService:
             "markdown_file_path": markdown_file_path
         }
     
+    @staticmethod
+    def _convert_to_markdown(file_type: str, file_path: str) -> str:
+        """
+        Convert a saved upload to markdown according to its file type.
+
+        Args:
+            file_type: File type from DocumentProcessor.get_file_type
+            file_path: Path to the saved upload
+
+        Returns:
+            Markdown content
+        """
+        import logging
+        if file_type == 'word':
+            return DocumentProcessor.word_to_markdown(file_path)
+        elif file_type == 'pdf':
+            logging.info(f"Converting PDF to markdown: {file_path}")
+            markdown_content = DocumentProcessor.pdf_to_markdown(file_path)
+            logging.info(f"PDF conversion result length: {len(markdown_content) if markdown_content else 0}")
+            return markdown_content
+        elif file_type == 'text':
+            return DocumentProcessor.text_to_markdown(file_path)
+        elif file_type == 'image':
+            # Use OpenAI Vision API for OCR
+            markdown_content = DocumentProcessor.ocr_image_with_openai(file_path)
+            if not markdown_content:
+                markdown_content = "# OCR Processing Failed\n\nCould not extract text from this image. Please check your OpenAI API key configuration."
+            return markdown_content
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unsupported file type"
+            )
+    
     @staticmethod
     def get_template_identifiers(db: Session, template_id: int) -> Optional[list[str]]:
         """
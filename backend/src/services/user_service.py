@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
 from typing import Optional
 from ..models.user import User, UserRole
 from ..schemas.user import UserCreate, UserUpdate
@@ -75,8 +76,15 @@ class UserService:
         if not include_inactive:
             query = query.filter(User.is_active == True)
         
-        total = query.count()
-        users = query.offset(skip).limit(limit).all()
+        # Fetch the page and the total together via a COUNT(*) OVER () window
+        rows = query.add_columns(func.count().over().label("total")).offset(skip).limit(limit).all()
+        users = [row[0] for row in rows]
+        
+        if rows:
+            total = rows[0].total
+        else:
+            # Page is past the end (or empty); only then is a separate count needed
+            total = query.count() if skip else 0
         
         return users, total
     
@@ -95,21 +103,17 @@ class UserService:
         Raises:
             HTTPException: If username or email already exists
         """
-        # Check if username exists
-        existing_user = db.query(User).filter(
-            User.username == user_data.username
-        ).first()
-        if existing_user:
+        # Check username and email in one query; at most two rows can conflict
+        conflicts = db.query(User.username, User.email).filter(
+            or_(User.username == user_data.username, User.email == user_data.email)
+        ).all()
+        if any(username == user_data.username for username, _ in conflicts):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already exists",
             )
         
-        # Check if email exists
-        existing_email = db.query(User).filter(
-            User.email == user_data.email
-        ).first()
-        if existing_email:
+        if conflicts:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already exists",
@@ -2,20 +2,36 @@
 
 import os
 import base64
+import hashlib
 import logging
-from typing import Optional, List
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional, List
 from docx import Document
 import PyPDF2
 import pdfplumber
 import markdown2
 import mammoth
 from pathlib import Path
-from datetime import datetime
 from io import BytesIO
 
+from ..config import settings
+from ..models.template import IDENTIFIER_PATTERN
+
+# Optional PDFium text extraction (much faster than pdfplumber's pure-Python parser)
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 # Optional imports for OCR
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     PDF2IMAGE_AVAILABLE = True
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
@@ -33,6 +49,51 @@ except ImportError:
     PIL_AVAILABLE = False
 
 
+# A line break with the whitespace (including blank lines) around it
+LINE_BREAK_PATTERN = re.compile(r'\s*\n\s*')
+
+# Characters dropped from template names used in filenames (keeps letters,
+# digits, underscores, spaces and hyphens)
+FILENAME_UNSAFE_PATTERN = re.compile(r'[^\w -]')
+
+# Upper bound on concurrent OpenAI Vision requests when OCR'ing a multi-page PDF
+OCR_MAX_CONCURRENT_PAGES = 8
+
+# Longest side, in pixels, of page images sent for OCR (OpenAI Vision's own limit)
+OCR_MAX_IMAGE_SIDE = 2048
+
+# Uploads are copied to disk in chunks of this size rather than read whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Supported upload extensions and the file type each converts as
+FILE_TYPES_BY_EXTENSION = {
+    '.doc': 'word',
+    '.docx': 'word',
+    '.pdf': 'pdf',
+    '.jpg': 'image',
+    '.jpeg': 'image',
+    '.png': 'image',
+    '.tiff': 'image',
+    '.tif': 'image',
+    '.bmp': 'image',
+    '.txt': 'text',
+}
+
+# Shared OpenAI client; its HTTP connection pool is reused across OCR requests
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def _get_openai_client():
+    """Get the process-wide OpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                _openai_client = OpenAI(api_key=settings.openai_api_key)
+    return _openai_client
+
+
 class DocumentProcessor:
     """Handles conversion of various document formats to Markdown."""
     
@@ -60,16 +121,9 @@ class DocumentProcessor:
                 result = mammoth.convert_to_markdown(docx_file)
                 markdown_content = result.value
 
-                # Clean up the markdown
-                lines = markdown_content.split('\n')
-                cleaned_lines = []
-                for line in lines:
-                    stripped = line.strip()
-                    if stripped:
-                        cleaned_lines.append(stripped)
-                        cleaned_lines.append("")  # Add blank line
-
-                return "\n".join(cleaned_lines).strip()
+                # Clean up the markdown: strip every line, drop blank ones and
+                # separate the rest with a blank line
+                return LINE_BREAK_PATTERN.sub('\n\n', markdown_content).strip()
         except Exception as e:
             # Fallback to python-docx if mammoth fails
             doc = Document(file_path)
@@ -98,8 +152,8 @@ class DocumentProcessor:
     @staticmethod
     def pdf_to_markdown(file_path: str) -> str:
         """
-        Convert PDF to Markdown text using pdfplumber for better text extraction.
-        Falls back to PyPDF2 if pdfplumber fails.
+        Convert PDF to Markdown text using PDFium (or pdfplumber, per the
+        pdf_text_extractor setting). Falls back to PyPDF2 if that fails.
         
         Args:
             file_path: Path to the PDF file
@@ -110,26 +164,53 @@ class DocumentProcessor:
         import logging
         markdown_lines = []
         
-        # Try pdfplumber first
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                logging.info(f"PDF has {len(pdf.pages)} pages")
-                for i, page in enumerate(pdf.pages):
-                    text = page.extract_text()
-                    logging.info(f"Page {i+1} extracted text length: {len(text) if text else 0}")
-                    if text:
-                        # Split into paragraphs (double newlines)
-                        paragraphs = text.split('\n\n')
-                        for para in paragraphs:
-                            # Clean up single newlines within paragraphs
-                            cleaned = para.replace('\n', ' ').strip()
-                            if cleaned:
-                                markdown_lines.append(cleaned)
-                                markdown_lines.append("")  # Blank line between paragraphs
-        except Exception as e:
-            logging.error(f"pdfplumber failed: {e}")
+        def add_paragraphs(text: str):
+            # Split into paragraphs (double newlines)
+            paragraphs = text.split('\n\n')
+            for para in paragraphs:
+                # Clean up single newlines within paragraphs
+                cleaned = para.replace('\n', ' ').strip()
+                if cleaned:
+                    markdown_lines.append(cleaned)
+                    markdown_lines.append("")  # Blank line between paragraphs
+        
+        # Try PDFium first when enabled
+        if PDFIUM_AVAILABLE and settings.pdf_text_extractor == "pdfium":
+            try:
+                pdf = pdfium.PdfDocument(file_path)
+                try:
+                    logging.info(f"PDFium: PDF has {len(pdf)} pages")
+                    for i, page in enumerate(pdf):
+                        textpage = page.get_textpage()
+                        # PDFium separates lines with CRLF
+                        text = textpage.get_text_range().replace('\r\n', '\n')
+                        textpage.close()
+                        page.close()
+                        logging.info(f"PDFium Page {i+1} extracted text length: {len(text)}")
+                        if text:
+                            add_paragraphs(text)
+                finally:
+                    pdf.close()
+            except Exception as e:
+                logging.error(f"PDFium failed: {e}")
+        
+        # Otherwise use pdfplumber
+        else:
+            try:
+                with pdfplumber.open(file_path) as pdf:
+                    logging.info(f"PDF has {len(pdf.pages)} pages")
+                    for i, page in enumerate(pdf.pages):
+                        text = page.extract_text()
+                        # Drop the page's parsed layout objects now rather than holding
+                        # every page's until the PDF is closed
+                        page.flush_cache()
+                        logging.info(f"Page {i+1} extracted text length: {len(text) if text else 0}")
+                        if text:
+                            add_paragraphs(text)
+            except Exception as e:
+                logging.error(f"pdfplumber failed: {e}")
         
-        # If pdfplumber didn't extract anything, try PyPDF2
+        # If nothing was extracted, try PyPDF2
         if not markdown_lines:
             logging.info("Trying PyPDF2 fallback")
             try:
@@ -216,11 +297,9 @@ class DocumentProcessor:
             True if valid, False otherwise
         """
         # Simple validation - just check that content exists and is not empty
-        # Any text is valid markdown, so we don't need strict validation
-        if not content or not content.strip():
-            return False
-
-        return True
+        # Any text is valid markdown, so we don't need strict validation.
+        # isspace() stops at the first non-whitespace character without copying
+        return bool(content) and not content.isspace()
     
     @staticmethod
     def extract_identifiers(content: str) -> list[str]:
@@ -231,39 +310,32 @@ class DocumentProcessor:
             content: Markdown content
             
         Returns:
-            List of unique identifiers
+            List of unique identifiers, in order of first appearance
         """
-        import re
-        pattern = r'<<([^>]+)>>'
-        matches = re.findall(pattern, content)
-        return list(set(matches))
+        return list(dict.fromkeys(m.group(1) for m in IDENTIFIER_PATTERN.finditer(content)))
     
     @staticmethod
-    def save_uploaded_file(file_content: bytes, filename: str, upload_dir: str) -> str:
+    def save_uploaded_file(file_obj: BinaryIO, filename: str, upload_dir: str) -> str:
         """
-        Save uploaded file to storage.
+        Save uploaded file to storage, copying it in chunks. The upload
+        directory must already exist.
         
         Args:
-            file_content: File content as bytes
+            file_obj: Readable binary file object with the upload's content
             filename: Original filename
             upload_dir: Directory to save the file
             
         Returns:
             Path to saved file
         """
-        # Create upload directory if it doesn't exist
-        Path(upload_dir).mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename to avoid conflicts
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Generate unique filename to avoid conflicts, even for uploads in the same second
         name, ext = os.path.splitext(filename)
-        unique_filename = f"{name}_{timestamp}{ext}"
+        unique_filename = f"{name}_{uuid.uuid4().hex}{ext}"
         
         file_path = os.path.join(upload_dir, unique_filename)
         
         with open(file_path, 'wb') as f:
-            f.write(file_content)
+            shutil.copyfileobj(file_obj, f, UPLOAD_CHUNK_SIZE)
         
         return file_path
     
@@ -278,18 +350,7 @@ class DocumentProcessor:
         Returns:
             File type: 'word', 'pdf', 'image', 'text', or None
         """
-        ext = os.path.splitext(filename)[1].lower()
-
-        if ext in ['.doc', '.docx']:
-            return 'word'
-        elif ext == '.pdf':
-            return 'pdf'
-        elif ext in ['.jpg', '.jpeg', '.png', '.tiff', '.tif', '.bmp']:
-            return 'image'
-        elif ext == '.txt':
-            return 'text'
-
-        return None
+        return FILE_TYPES_BY_EXTENSION.get(os.path.splitext(filename)[1].lower())
 
     @staticmethod
     def save_markdown_file(
@@ -315,12 +376,13 @@ class DocumentProcessor:
         upload_dir = root_dir / base_dir
         upload_dir.mkdir(parents=True, exist_ok=True)
 
-        # Generate filename: templatename_username_timestamp.md
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Generate filename: templatename_username_timestamp_random.md; the random
+        # suffix keeps saves within the same second from overwriting each other
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         # Clean template name for filename (remove special characters)
-        clean_template_name = "".join(c for c in template_name if c.isalnum() or c in (' ', '-', '_')).strip()
+        clean_template_name = FILENAME_UNSAFE_PATTERN.sub('', template_name).strip()
         clean_template_name = clean_template_name.replace(' ', '_')
-        filename = f"{clean_template_name}_{username}_{timestamp}.md"
+        filename = f"{clean_template_name}_{username}_{timestamp}_{uuid.uuid4().hex[:8]}.md"
 
         file_path = upload_dir / filename
 
@@ -356,59 +418,170 @@ class DocumentProcessor:
             logging.error("OpenAI API key not configured")
             return None
         
+        cache_path = DocumentProcessor._ocr_cache_path(file_path)
+        cached = DocumentProcessor._read_ocr_cache(cache_path)
+        if cached is not None:
+            logging.info(f"Using cached OCR result for {file_path}")
+            return cached
+        
         try:
-            # Convert PDF pages to images
-            logging.info(f"Converting PDF to images: {file_path}")
-            images = convert_from_path(file_path, dpi=150)
-            logging.info(f"Converted {len(images)} pages to images")
+            page_count = pdfinfo_from_path(file_path)["Pages"]
+            logging.info(f"OCR'ing {page_count} PDF pages: {file_path}")
             
-            client = OpenAI(api_key=settings.openai_api_key)
-            all_text = []
+            client = _get_openai_client()
             
-            for i, image in enumerate(images):
-                logging.info(f"Processing page {i+1} with OpenAI Vision")
-                
-                # Convert PIL image to base64
-                buffered = BytesIO()
-                image.save(buffered, format="PNG")
-                img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-                
-                # Call OpenAI Vision API
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": "Please extract all the text from this document image. Preserve the structure and formatting as much as possible. Output the text in markdown format. If there are form fields or placeholders, preserve them. Do not add any commentary, just output the extracted text."
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{img_base64}"
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=4096
-                )
-                
-                page_text = response.choices[0].message.content
-                if page_text:
-                    all_text.append(f"<!-- Page {i+1} -->\n{page_text}")
-                    logging.info(f"Page {i+1} extracted {len(page_text)} characters")
+            # Pages are rasterised and OCR'd concurrently, each in its own task, so
+            # only as many page images as there are workers are held in memory.
+            # map() keeps the results in page order and re-raises a page's error
+            with ThreadPoolExecutor(max_workers=min(page_count, OCR_MAX_CONCURRENT_PAGES) or 1) as pool:
+                page_texts = list(pool.map(
+                    lambda i: DocumentProcessor._ocr_pdf_page(client, file_path, i),
+                    range(page_count)
+                ))
+            
+            all_text = [
+                f"<!-- Page {i+1} -->\n{page_text}"
+                for i, page_text in enumerate(page_texts)
+                if page_text
+            ]
             
             result = "\n\n".join(all_text)
             logging.info(f"Total OCR result: {len(result)} characters")
+            DocumentProcessor._write_ocr_cache(cache_path, result)
             return result
             
         except Exception as e:
             logging.error(f"OpenAI Vision OCR failed: {e}")
             return None
     
+    @staticmethod
+    def _ocr_cache_path(file_path: str) -> Optional[Path]:
+        """
+        Get the OCR cache file for a document, keyed by the SHA-256 of its content.
+        
+        Args:
+            file_path: Path to the document
+            
+        Returns:
+            Cache file path, or None if caching is disabled or the file is unreadable
+        """
+        if not settings.ocr_cache_dir:
+            return None
+        
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        except OSError as e:
+            logging.warning(f"Could not hash {file_path} for the OCR cache: {e}")
+            return None
+        
+        root_dir = Path(__file__).parent.parent.parent.parent  # Go up to project root
+        return root_dir / settings.ocr_cache_dir.lstrip('./') / f"{digest.hexdigest()}.md"
+    
+    @staticmethod
+    def _read_ocr_cache(cache_path: Optional[Path]) -> Optional[str]:
+        """
+        Read a cached OCR result, marking it as recently used.
+        
+        Args:
+            cache_path: Cache file from _ocr_cache_path
+            
+        Returns:
+            Cached markdown, or None on a miss
+        """
+        if cache_path is None:
+            return None
+        try:
+            content = cache_path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+        # Refresh the mtime so pruning by age removes least recently used entries
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return content
+    
+    @staticmethod
+    def _write_ocr_cache(cache_path: Optional[Path], content: Optional[str]) -> None:
+        """
+        Store a successful OCR result. Written to a temporary file and renamed,
+        so concurrent readers never see a partial entry.
+        
+        Args:
+            cache_path: Cache file from _ocr_cache_path
+            content: OCR markdown (empty results are not cached)
+        """
+        if cache_path is None or not content:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_text(content, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write OCR cache entry {cache_path}: {e}")
+    
+    @staticmethod
+    def _ocr_pdf_page(client, file_path: str, i: int) -> Optional[str]:
+        """
+        Render one PDF page and OCR it with OpenAI Vision.
+        
+        Args:
+            client: OpenAI client
+            file_path: Path to the PDF file
+            i: Zero-based page index
+            
+        Returns:
+            Extracted page text as markdown, if any
+        """
+        # pdftoppm runs as a subprocess, so pages render in parallel across threads
+        image = convert_from_path(file_path, dpi=150, first_page=i + 1, last_page=i + 1)[0]
+        logging.info(f"Processing page {i+1} with OpenAI Vision")
+        
+        # The API downscales images to fit OCR_MAX_IMAGE_SIDE anyway, so larger
+        # pages are shrunk first rather than encoded and uploaded at full size.
+        # (pdf2image depends on Pillow, so Image is always importable here)
+        image.thumbnail((OCR_MAX_IMAGE_SIDE, OCR_MAX_IMAGE_SIDE), Image.LANCZOS)
+        
+        # Convert PIL image to base64; getbuffer() avoids copying the PNG bytes.
+        # Deflate time dominates PNG encoding and the upload is only a few MB,
+        # so the fastest compression level is used
+        buffered = BytesIO()
+        image.save(buffered, format="PNG", compress_level=1)
+        with buffered.getbuffer() as png:
+            img_base64 = base64.b64encode(png).decode('ascii')
+        
+        # Call OpenAI Vision API
+        response = client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": "Please extract all the text from this document image. Preserve the structure and formatting as much as possible. Output the text in markdown format. If there are form fields or placeholders, preserve them. Do not add any commentary, just output the extracted text."
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/png;base64,{img_base64}"
+                            }
+                        }
+                    ]
+                }
+            ],
+            max_tokens=4096
+        )
+        
+        page_text = response.choices[0].message.content
+        if page_text:
+            logging.info(f"Page {i+1} extracted {len(page_text)} characters")
+        return page_text
+    
     @staticmethod
     def ocr_image_with_openai(file_path: str) -> Optional[str]:
         """
@@ -434,6 +607,12 @@ class DocumentProcessor:
             logging.error("OpenAI API key not configured")
             return None
         
+        cache_path = DocumentProcessor._ocr_cache_path(file_path)
+        cached = DocumentProcessor._read_ocr_cache(cache_path)
+        if cached is not None:
+            logging.info(f"Using cached OCR result for {file_path}")
+            return cached
+        
         try:
             logging.info(f"Processing image with OpenAI Vision: {file_path}")
             
@@ -452,7 +631,7 @@ class DocumentProcessor:
                 '.bmp': 'image/bmp'
             }.get(ext, 'image/png')
             
-            client = OpenAI(api_key=settings.openai_api_key)
+            client = _get_openai_client()
             
             response = client.chat.completions.create(
                 model="gpt-4o",
@@ -478,6 +657,7 @@ class DocumentProcessor:
             
             result = response.choices[0].message.content
             logging.info(f"Image OCR result: {len(result) if result else 0} characters")
+            DocumentProcessor._write_ocr_cache(cache_path, result)
             return result
             
         except Exception as e:
@@ -1,10 +1,58 @@
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Optional
 from ..config import settings
 
 
+# Each thread keeps its SMTP connection open between sends, so the TLS
+# handshake and login are paid once rather than per email
+_smtp_local = threading.local()
+
+
+def _get_smtp_connection() -> smtplib.SMTP:
+    """
+    Get this thread's SMTP connection, connecting and logging in if needed.
+    
+    Returns:
+        Connected SMTP client
+    """
+    server = getattr(_smtp_local, 'server', None)
+    if server is not None:
+        # The server may have dropped the connection while it sat idle;
+        # a NOOP is cheap next to sending into a dead socket
+        try:
+            code, _ = server.noop()
+        except (smtplib.SMTPException, OSError):
+            code = None
+        if code != 250:
+            _drop_smtp_connection()
+            server = None
+    if server is None:
+        server = smtplib.SMTP(settings.smtp_host, settings.smtp_port)
+        try:
+            server.starttls()
+            if settings.smtp_user and settings.smtp_password:
+                server.login(settings.smtp_user, settings.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        _smtp_local.server = server
+    return server
+
+
+def _drop_smtp_connection() -> None:
+    """Close and forget this thread's SMTP connection, ignoring errors."""
+    server = getattr(_smtp_local, 'server', None)
+    _smtp_local.server = None
+    if server is not None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+
 def send_email(
     to_email: str,
     subject: str,
@@ -47,22 +95,32 @@ def send_email(
             part2 = MIMEText(html_body, 'html')
             msg.attach(part2)
         
-        # Connect to SMTP server and send
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            server.starttls()
-            if settings.smtp_user and settings.smtp_password:
-                server.login(settings.smtp_user, settings.smtp_password)
-            
-            recipients = [to_email]
-            if cc:
-                recipients.extend(cc)
-            if bcc:
-                recipients.extend(bcc)
-            
-            server.sendmail(settings.email_from, recipients, msg.as_string())
+        recipients = [to_email]
+        if cc:
+            recipients.extend(cc)
+        if bcc:
+            recipients.extend(bcc)
+        
+        # Send over the reused connection; if it fails anyway (closed between
+        # the health check and the send, or a 421 from the server), reconnect
+        # once and retry. SMTP errors are OSErrors too, so they are checked
+        # first: any other reply is a rejection, and resending could deliver
+        # the message twice
+        try:
+            _get_smtp_connection().sendmail(settings.email_from, recipients, msg.as_string())
+        except smtplib.SMTPException as e:
+            if not isinstance(e, smtplib.SMTPServerDisconnected) and getattr(e, 'smtp_code', None) != 421:
+                raise
+            _drop_smtp_connection()
+            _get_smtp_connection().sendmail(settings.email_from, recipients, msg.as_string())
+        except OSError:
+            _drop_smtp_connection()
+            _get_smtp_connection().sendmail(settings.email_from, recipients, msg.as_string())
         
         return True
     except Exception as e:
+        # The connection may be in an unknown state; start afresh next time
+        _drop_smtp_connection()
         # Log error in production
         print(f"Failed to send email: {str(e)}")
         return False
@@ -1,8 +1,8 @@
+import asyncio
 import os
 import uuid
 from pathlib import Path
 from typing import Optional
-import aiofiles
 from ..config import settings
 
 
@@ -16,6 +16,39 @@ def ensure_directory_exists(directory: str) -> None:
     Path(directory).mkdir(parents=True, exist_ok=True)
 
 
+def _write_bytes(file_path: str, content: bytes) -> None:
+    """
+    Write bytes to a file, creating its directory if necessary.
+    
+    Args:
+        file_path: Full path to file
+        content: Content to write
+    """
+    ensure_directory_exists(os.path.dirname(file_path))
+    with open(file_path, 'wb') as f:
+        f.write(content)
+
+
+def _read_bytes(file_path: str) -> bytes:
+    """
+    Read a whole file.
+    
+    Args:
+        file_path: Full path to file
+        
+    Returns:
+        File content as bytes
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
 def generate_unique_filename(original_filename: str) -> str:
     """
     Generate a unique filename using UUID while preserving extension.
@@ -56,14 +89,11 @@ async def save_upload_file(
     else:
         directory = settings.upload_dir
     
-    ensure_directory_exists(directory)
-    
     # Full file path
     file_path = os.path.join(directory, stored_filename)
     
-    # Save file asynchronously
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(file_content)
+    # Create the directory and write the file in one worker thread hop
+    await asyncio.to_thread(_write_bytes, file_path, file_content)
     
     return stored_filename, file_path
 
@@ -86,14 +116,12 @@ async def save_generated_document(
     """
     # Create client-specific subdirectory
     directory = os.path.join(settings.generated_dir, str(client_id))
-    ensure_directory_exists(directory)
     
     # Full file path
     file_path = os.path.join(directory, filename)
     
-    # Save file asynchronously
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(file_content)
+    # Create the directory and write the file in one worker thread hop
+    await asyncio.to_thread(_write_bytes, file_path, file_content)
     
     return file_path
 
@@ -111,13 +139,7 @@ async def read_file(file_path: str) -> bytes:
     Raises:
         FileNotFoundError: If file doesn't exist
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
-    
-    async with aiofiles.open(file_path, 'rb') as f:
-        content = await f.read()
-    
-    return content
+    return await asyncio.to_thread(_read_bytes, file_path)
 
 
 def delete_file(file_path: str) -> bool:
@@ -0,0 +1,83 @@
+"""Compilation and evaluation helpers for question group logic."""
+
+import json
+from typing import Any, List, Optional
+
+
+def compile_question_logic(question_logic: Optional[List[dict]]) -> List[list]:
+    """
+    Flatten a nested question_logic tree into a linear plan.
+
+    The plan is a JSON-serializable list of ops, evaluated front to back:
+
+    - ["Q", question_id, depth, stop_flow]: show a question; stop_flow halts the plan
+    - ["COND", if_identifier, operator, value, skip_to]: if the condition is
+      not met, jump to index skip_to (just past the matching END)
+    - ["END", end_flow]: close a conditional whose condition was met;
+      end_flow halts the plan
+
+    Args:
+        question_logic: Question logic items as stored on the group
+
+    Returns:
+        Flat list of ops
+    """
+    plan: List[list] = []
+
+    def emit(items: List[dict], depth: int) -> None:
+        for item in items:
+            if item.get('type') == 'question':
+                plan.append(["Q", item.get('questionId'), depth, bool(item.get('stopFlow'))])
+
+            elif item.get('type') == 'conditional' and item.get('conditional'):
+                cond = item['conditional']
+                start = len(plan)
+                # Default to 'equals' for backwards compatibility
+                plan.append(["COND", cond.get('ifIdentifier'), cond.get('operator', 'equals'), cond.get('value'), None])
+                emit(cond.get('nestedItems') or [], depth + 1)
+                plan.append(["END", bool(cond.get('endFlow'))])
+                plan[start][4] = len(plan)
+
+    emit(question_logic or [], 0)
+    return plan
+
+
+def condition_met(actual_value: str, operator: Optional[str], expected_value: Any) -> bool:
+    """
+    Evaluate a conditional against a non-empty answer value.
+
+    Args:
+        actual_value: The answer to the referenced question
+        operator: 'equals' (default), 'not_equals', or a count operator
+        expected_value: Value (or count threshold) from the conditional
+
+    Returns:
+        True if the condition holds
+    """
+    if operator == 'not_equals':
+        return actual_value != expected_value
+
+    if operator in ('count_greater_than', 'count_equals', 'count_less_than'):
+        # Count operators for repeatable fields - parse JSON array and compare length
+        try:
+            parsed = json.loads(actual_value)
+            if isinstance(parsed, list):
+                count = len(parsed)
+            else:
+                count = 1  # Non-array value counts as 1
+        except (json.JSONDecodeError, TypeError):
+            count = 1 if actual_value else 0  # Non-JSON value counts as 1 if not empty
+
+        try:
+            threshold = int(expected_value)
+        except (ValueError, TypeError):
+            threshold = 0
+
+        if operator == 'count_greater_than':
+            return count > threshold
+        if operator == 'count_equals':
+            return count == threshold
+        return count < threshold
+
+    # 'equals' or default
+    return actual_value == expected_value
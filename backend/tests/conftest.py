@@ -22,6 +22,15 @@ def engine():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_identifier_caches():
+    """Reset in-process identifier caches so IDs don't leak between test databases."""
+    from src.services import question_service
+    question_service._group_id_cache.clear()
+    question_service._question_id_cache.clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db_session(engine):
     """Create a new database session for each test."""
@@ -0,0 +1,68 @@
+"""Unit tests for email sending."""
+
+import smtplib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils import email
+
+
+@pytest.fixture(autouse=True)
+def reset_smtp_connection():
+    """Start each test without a cached SMTP connection."""
+    email._smtp_local.server = None
+    yield
+    email._smtp_local.server = None
+
+
+def _smtp_client(sendmail_error=None):
+    """Mocked SMTP client whose first sendmail call raises sendmail_error."""
+    client = MagicMock()
+    client.noop.return_value = (250, b"OK")
+    if sendmail_error is not None:
+        client.sendmail.side_effect = sendmail_error
+    return client
+
+
+class TestSendEmail:
+    """Test suite for send_email."""
+    
+    def test_retries_once_on_421(self):
+        """Test that a 421 reply reconnects and resends once."""
+        refused = _smtp_client(smtplib.SMTPSenderRefused(421, b"Service not available", "from@example.com"))
+        fresh = _smtp_client()
+        
+        with patch("src.utils.email.smtplib.SMTP", side_effect=[refused, fresh]) as smtp:
+            assert email.send_email("to@example.com", "Subject", "Body")
+        
+        assert smtp.call_count == 2
+        refused.sendmail.assert_called_once()
+        fresh.sendmail.assert_called_once()
+    
+    @pytest.mark.parametrize("error", [
+        smtplib.SMTPSenderRefused(550, b"Mailbox unavailable", "from@example.com"),
+        smtplib.SMTPDataError(554, b"Transaction failed"),
+    ])
+    def test_does_not_retry_permanent_rejection(self, error):
+        """Test that a permanent rejection is not resent."""
+        rejected = _smtp_client(error)
+        
+        with patch("src.utils.email.smtplib.SMTP", return_value=rejected) as smtp:
+            assert not email.send_email("to@example.com", "Subject", "Body")
+        
+        assert smtp.call_count == 1
+        rejected.sendmail.assert_called_once()
+    
+    def test_reconnects_when_reused_connection_is_dead(self):
+        """Test that a connection failing the NOOP check is replaced before sending."""
+        dead = _smtp_client()
+        dead.noop.side_effect = ConnectionResetError()
+        email._smtp_local.server = dead
+        fresh = _smtp_client()
+        
+        with patch("src.utils.email.smtplib.SMTP", return_value=fresh):
+            assert email.send_email("to@example.com", "Subject", "Body")
+        
+        dead.sendmail.assert_not_called()
+        fresh.sendmail.assert_called_once()
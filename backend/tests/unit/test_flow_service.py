@@ -0,0 +1,64 @@
+"""Unit tests for flow service."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.services.flow_service import FlowService
+from src.schemas.flow import DocumentFlowCreate
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations" / "versions"
+
+
+def _load_migration(filename: str):
+    """Import a migration module by file name (revision files are not importable by name)."""
+    spec = importlib.util.spec_from_file_location(filename[:-3], MIGRATIONS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def migrated_session(engine):
+    """Session whose flow name index was built by migration 024 rather than create_all."""
+    migration = _load_migration("024_partial_unique_flow_name.py")
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX IF EXISTS ux_flow_name_active"))
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+    
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.rollback()
+    session.close()
+
+
+class TestFlowService:
+    """Test suite for FlowService."""
+    
+    def test_create_flow_duplicate_active_name(self, migrated_session: Session):
+        """Test that two active flows cannot share a name."""
+        FlowService.create_flow(migrated_session, DocumentFlowCreate(name="Estate Plan"), 1)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            FlowService.create_flow(migrated_session, DocumentFlowCreate(name="Estate Plan"), 1)
+        
+        assert exc_info.value.status_code == 400
+        assert "already exists" in str(exc_info.value.detail)
+    
+    def test_create_flow_reuses_deleted_name(self, migrated_session: Session):
+        """Test that a soft-deleted flow's name can be used again."""
+        flow = FlowService.create_flow(migrated_session, DocumentFlowCreate(name="Estate Plan"), 1)
+        assert FlowService.delete_flow(migrated_session, flow.id)
+        
+        recreated = FlowService.create_flow(migrated_session, DocumentFlowCreate(name="Estate Plan"), 1)
+        
+        assert recreated.id != flow.id
+        assert recreated.is_active
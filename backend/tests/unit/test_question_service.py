@@ -6,6 +6,7 @@ including adding questions, deleting questions, inserting conditionals, reorderi
 
 import pytest
 from unittest.mock import Mock, patch
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from typing import List, Dict, Any
@@ -166,6 +167,98 @@ class TestQuestionGroupService:
         assert total == 5
         assert len(groups) == 2
 
+    def test_list_question_groups_page_past_end(self, db_session: Session):
+        """Test that the total is still reported when the page is past the end."""
+        for i in range(3):
+            group_data = QuestionGroupCreate(
+                name=f"Group {i}",
+                identifier=f"past_end_group_{i}",
+                display_order=i
+            )
+            QuestionGroupService.create_question_group(db_session, group_data)
+
+        groups, total = QuestionGroupService.list_question_groups(db_session, skip=10, limit=2)
+
+        assert total == 3
+        assert groups == []
+
+    def test_list_question_groups_columns(self, db_session: Session):
+        """Test that a column subset defers the remaining attributes."""
+        QuestionGroupService.create_question_group(
+            db_session,
+            QuestionGroupCreate(name="Summary", identifier="summary_group", description="Not needed")
+        )
+        db_session.expunge_all()
+
+        groups, total = QuestionGroupService.list_question_groups(
+            db_session, columns=["name", "identifier", "display_order", "is_active"]
+        )
+
+        assert total == 1
+        state = inspect(groups[0])
+        assert "identifier" not in state.unloaded
+        assert "description" in state.unloaded
+
+    def test_list_question_group_rows(self, db_session: Session):
+        """Test listing groups as plain rows with the total."""
+        for i in range(3):
+            QuestionGroupService.create_question_group(
+                db_session, QuestionGroupCreate(name=f"Group {i}", identifier=f"row_group_{i}")
+            )
+
+        rows, total = QuestionGroupService.list_question_group_rows(
+            db_session, ["id", "identifier"], skip=0, limit=2
+        )
+
+        assert total == 3
+        assert [row.identifier for row in rows] == ["row_group_2", "row_group_1"]
+
+    def test_list_question_groups_load_questions(self, db_session: Session):
+        """Test that questions are eager-loaded and other lazy loads are blocked."""
+        from sqlalchemy.exc import InvalidRequestError
+
+        group = QuestionGroupService.create_question_group(
+            db_session,
+            QuestionGroupCreate(name="Loaded Group", identifier="loaded_group")
+        )
+        QuestionService.create_question(db_session, QuestionCreate(
+            question_group_id=group.id,
+            question_text="Name?",
+            question_type="free_text",
+            identifier="name"
+        ))
+        db_session.expunge_all()
+
+        groups, total = QuestionGroupService.list_question_groups(db_session, load_questions=True)
+
+        assert total == 1
+        assert [q.identifier for q in groups[0].questions] == ["loaded_group.name"]
+        with pytest.raises(InvalidRequestError):
+            groups[0].questions[0].question_group
+
+    def test_get_groups_with_questions(self, db_session: Session):
+        """Test preloading groups with their questions."""
+        group = QuestionGroupService.create_question_group(
+            db_session, QuestionGroupCreate(name="Preloaded", identifier="preloaded")
+        )
+        QuestionGroupService.create_question_group(
+            db_session, QuestionGroupCreate(name="Other", identifier="other")
+        )
+        QuestionService.create_question(db_session, QuestionCreate(
+            question_group_id=group.id,
+            question_text="Question",
+            question_type=QuestionType.FREE_TEXT,
+            identifier="q1"
+        ))
+        db_session.expunge_all()
+
+        groups = QuestionGroupService.get_groups_with_questions(db_session, [group.id])
+
+        assert [g.id for g in groups] == [group.id]
+        assert "questions" not in inspect(groups[0]).unloaded
+        assert [q.identifier for q in groups[0].questions] == ["preloaded.q1"]
+        assert QuestionGroupService.get_question_group_by_id(db_session, group.id) is groups[0]
+
     def test_update_question_group(self, db_session: Session):
         """Test updating a question group."""
         group_data = QuestionGroupCreate(
@@ -184,6 +277,45 @@ class TestQuestionGroupService:
         assert updated.description == "New description"
         assert updated.identifier == "update_test"  # Unchanged
 
+    def test_update_question_group_no_changes(self, db_session: Session):
+        """Test that an update matching the stored values is a no-op."""
+        group_data = QuestionGroupCreate(
+            name="Same Name",
+            identifier="noop_test"
+        )
+        created = QuestionGroupService.create_question_group(db_session, group_data)
+        original_updated_at = created.updated_at
+
+        update_data = QuestionGroupUpdate(name="Same Name")
+        updated = QuestionGroupService.update_question_group(db_session, created.id, update_data)
+
+        assert updated.name == "Same Name"
+        assert updated.updated_at == original_updated_at
+        assert not db_session.dirty
+
+    def test_update_question_group_compiles_logic(self, db_session: Session):
+        """Test that saving question logic also stores its compiled plan."""
+        created = QuestionGroupService.create_question_group(
+            db_session, QuestionGroupCreate(name="Compiled", identifier="compiled_test")
+        )
+        logic = [
+            create_question_logic_item(1),
+            create_conditional_logic_item("c1", "compiled_test.q1", "equals", "yes", [
+                create_question_logic_item(2)
+            ])
+        ]
+
+        updated = QuestionGroupService.update_question_group(
+            db_session, created.id, QuestionGroupUpdate(question_logic=logic)
+        )
+
+        assert updated.question_logic_compiled == [
+            ["Q", 1, 0, False],
+            ["COND", "compiled_test.q1", "equals", "yes", 4],
+            ["Q", 2, 1, False],
+            ["END", False]
+        ]
+
     def test_update_question_group_not_found(self, db_session: Session):
         """Test updating a non-existent question group raises error."""
         update_data = QuestionGroupUpdate(name="New Name")
@@ -366,6 +498,49 @@ class TestQuestionService:
 
         assert exc_info.value.status_code == 404
 
+    def test_create_questions_bulk(self, db_session: Session, sample_group):
+        """Test creating several questions in one batch."""
+        items = [
+            QuestionCreate(
+                question_group_id=sample_group.id,
+                question_text=f"Question {i}",
+                question_type=QuestionType.FREE_TEXT,
+                identifier=f"bulk_{i}",
+                display_order=i
+            )
+            for i in range(5)
+        ]
+
+        questions = QuestionService.create_questions_bulk(db_session, items, batch_size=2)
+
+        assert [q.identifier for q in questions] == [f"sample.bulk_{i}" for i in range(5)]
+        assert all(q.id is not None for q in questions)
+        assert len(QuestionService.list_questions_by_group(db_session, sample_group.id)) == 5
+
+    def test_create_questions_bulk_duplicate_identifier(self, db_session: Session, sample_group):
+        """Test that a duplicate identifier rejects the whole batch."""
+        QuestionService.create_question(db_session, QuestionCreate(
+            question_group_id=sample_group.id,
+            question_text="Existing",
+            question_type=QuestionType.FREE_TEXT,
+            identifier="existing"
+        ))
+        items = [
+            QuestionCreate(
+                question_group_id=sample_group.id,
+                question_text=text,
+                question_type=QuestionType.FREE_TEXT,
+                identifier=identifier
+            )
+            for text, identifier in [("New", "new"), ("Clash", "existing")]
+        ]
+
+        with pytest.raises(HTTPException) as exc_info:
+            QuestionService.create_questions_bulk(db_session, items)
+
+        assert exc_info.value.status_code == 400
+        assert QuestionService.get_question_by_identifier(db_session, "sample.new") is None
+
     def test_get_question_by_id(self, db_session: Session, sample_group):
         """Test getting a question by ID."""
         question_data = QuestionCreate(
@@ -396,6 +571,40 @@ class TestQuestionService:
         assert found is not None
         assert found.question_text == "Identifiable question"
 
+    def test_get_question_by_identifier_evicted_on_delete(self, db_session: Session, sample_group):
+        """Test that a cached identifier lookup does not outlive the question."""
+        question_data = QuestionCreate(
+            question_group_id=sample_group.id,
+            question_text="Cached question",
+            question_type=QuestionType.FREE_TEXT,
+            identifier="cached"
+        )
+        created = QuestionService.create_question(db_session, question_data)
+
+        assert QuestionService.get_question_id_by_identifier(db_session, "sample.cached") == created.id
+
+        QuestionService.delete_question(db_session, created.id)
+
+        assert QuestionService.get_question_by_identifier(db_session, "sample.cached") is None
+        assert QuestionService.get_question_id_by_identifier(db_session, "sample.cached") is None
+
+    def test_get_question_id_by_identifier_rechecks_cached_id(self, db_session: Session, sample_group):
+        """Test that a cached ID is not returned once the question is gone."""
+        question_data = QuestionCreate(
+            question_group_id=sample_group.id,
+            question_text="Stale question",
+            question_type=QuestionType.FREE_TEXT,
+            identifier="stale"
+        )
+        created = QuestionService.create_question(db_session, question_data)
+        assert QuestionService.get_question_id_by_identifier(db_session, "sample.stale") == created.id
+
+        # Delete behind the service's back, as another worker would
+        db_session.query(Question).filter(Question.id == created.id).delete()
+        db_session.commit()
+
+        assert QuestionService.get_question_id_by_identifier(db_session, "sample.stale") is None
+
     def test_list_questions_by_group(self, db_session: Session, sample_group):
         """Test listing questions for a group."""
         for i in range(3):
@@ -412,6 +621,46 @@ class TestQuestionService:
 
         assert len(questions) == 3
 
+    def test_list_questions_by_group_columns(self, db_session: Session, sample_group):
+        """Test that a column subset defers the remaining attributes."""
+        question_data = QuestionCreate(
+            question_group_id=sample_group.id,
+            question_text="Summary question",
+            question_type=QuestionType.FREE_TEXT,
+            identifier="summary",
+            help_text="Not needed for a summary"
+        )
+        QuestionService.create_question(db_session, question_data)
+        group_id = sample_group.id
+        db_session.expunge_all()
+
+        questions = QuestionService.list_questions_by_group(
+            db_session, group_id, columns=["identifier", "question_text"]
+        )
+
+        assert len(questions) == 1
+        state = inspect(questions[0])
+        assert "question_text" not in state.unloaded
+        assert "help_text" in state.unloaded
+
+    def test_list_question_rows(self, db_session: Session, sample_group):
+        """Test listing questions as plain rows in display order."""
+        for order, identifier in [(2, "second"), (1, "first")]:
+            QuestionService.create_question(db_session, QuestionCreate(
+                question_group_id=sample_group.id,
+                question_text=identifier,
+                question_type=QuestionType.FREE_TEXT,
+                identifier=identifier,
+                display_order=order
+            ))
+
+        rows = QuestionService.list_question_rows(
+            db_session, [sample_group.id], ["id", "identifier"]
+        )
+
+        assert [row.identifier for row in rows] == ["sample.first", "sample.second"]
+        assert QuestionService.list_question_rows(db_session, [], ["id"]) == []
+
     def test_update_question(self, db_session: Session, sample_group):
         """Test updating a question."""
         question_data = QuestionCreate(
@@ -95,6 +95,20 @@ class TestSessionService:
         assert total == 5
         assert len(sessions) == 2
     
+    def test_list_sessions_page_past_end(self, db_session: Session, sample_question_group):
+        """Test that the total is still reported when the page is past the end."""
+        for i in range(3):
+            session_data = InputFormCreate(
+                client_identifier=f"Client {i}",
+                starting_group_id=sample_question_group.id
+            )
+            SessionService.create_session(db_session, session_data, 1)
+        
+        sessions, total = SessionService.list_sessions(db_session, 1, skip=10, limit=2)
+        
+        assert total == 3
+        assert sessions == []
+    
     def test_submit_answers_success(self, db_session: Session, sample_session, sample_questions):
         """Test submitting answers successfully."""
         answers = [
@@ -175,6 +189,26 @@ class TestSessionService:
         
         assert updated_answer.answer_value == "Updated Answer"
     
+    def test_save_answers_upserts(self, db_session: Session, sample_session, sample_questions):
+        """Test that saving answers inserts new ones and overwrites existing ones."""
+        SessionService.save_answers(db_session, sample_session.id, sample_session.user_id, [
+            SessionAnswerCreate(question_id=sample_questions[0].id, answer_value="First"),
+        ])
+        SessionService.save_answers(db_session, sample_session.id, sample_session.user_id, [
+            SessionAnswerCreate(question_id=sample_questions[0].id, answer_value="Changed"),
+            SessionAnswerCreate(question_id=sample_questions[1].id, answer_value="New"),
+            SessionAnswerCreate(question_id=sample_questions[1].id, answer_value="Newer"),
+        ])
+
+        saved = {
+            a.question_id: a.answer_value
+            for a in db_session.query(SessionAnswer).filter(
+                SessionAnswer.session_id == sample_session.id
+            )
+        }
+
+        assert saved == {sample_questions[0].id: "Changed", sample_questions[1].id: "Newer"}
+    
     def test_conditional_flow_navigation(self, db_session: Session, sample_session_with_flow, sample_questions):
         """Test conditional flow navigation based on answers."""
         # Answer that triggers conditional flow
@@ -244,6 +278,95 @@ class TestSessionService:
         
         assert len(answers) == len(sample_questions)
     
+    def test_get_groups_from_flow_logic(self, db_session: Session, sample_session, sample_questions):
+        """Test that flow groups follow answered conditionals and are not repeated."""
+        second_group = QuestionGroup(name="Second", identifier="second_group", display_order=2)
+        skipped_group = QuestionGroup(name="Skipped", identifier="skipped_group", display_order=3)
+        db_session.add_all([second_group, skipped_group])
+        db_session.add(SessionAnswer(
+            session_id=sample_session.id,
+            question_id=sample_questions[0].id,
+            answer_value="yes"
+        ))
+        db_session.commit()
+
+        flow_logic = [
+            {"type": "group", "groupId": sample_session.current_group_id},
+            {"type": "conditional", "conditional": {
+                "identifier": sample_questions[0].identifier,
+                "value": "yes",
+                "targetGroupId": second_group.id,
+                "nestedSteps": [{"type": "group", "groupId": sample_session.current_group_id}]
+            }},
+            {"type": "conditional", "conditional": {
+                "identifier": sample_questions[0].identifier,
+                "value": "no",
+                "targetGroupId": skipped_group.id
+            }}
+        ]
+
+        groups = SessionService._get_groups_from_flow_logic(db_session, flow_logic, sample_session.id)
+
+        assert [g.id for g in groups] == [sample_session.current_group_id, second_group.id]
+
+    def test_get_questions_from_logic(self, db_session: Session, sample_session_with_flow, sample_questions):
+        """Test that nested questions are shown only when their condition is met."""
+        group = db_session.get(QuestionGroup, sample_session_with_flow.current_group_id)
+
+        shown, conditional_identifiers = SessionService._get_questions_from_logic(db_session, group, {})
+        assert [(q.id, depth) for q, depth in shown] == [(sample_questions[0].id, 0)]
+        assert conditional_identifiers == {sample_questions[0].identifier}
+
+        shown, _ = SessionService._get_questions_from_logic(
+            db_session, group, {sample_questions[0].id: "Male"}
+        )
+        assert [(q.id, depth) for q, depth in shown] == [
+            (sample_questions[0].id, 0),
+            (sample_questions[1].id, 1)
+        ]
+
+    def test_get_session_questions_pagination_without_logic(self, db_session: Session, sample_session, sample_questions):
+        """Test paging through a group that has no question logic."""
+        response = SessionService.get_session_questions(
+            db_session, sample_session.id, sample_session.user_id, page=2, questions_per_page=2
+        )
+
+        assert response.total_pages == 2
+        assert response.current_page == 2
+        assert [q.id for q in response.questions] == [sample_questions[2].id]
+
+        response = SessionService.get_session_questions(
+            db_session, sample_session.id, sample_session.user_id, page=5, questions_per_page=2
+        )
+
+        assert response.current_page == 2
+        assert [q.id for q in response.questions] == [sample_questions[2].id]
+
+    def test_get_questions_from_logic_end_flow(self, db_session: Session, sample_question_group, sample_questions):
+        """Test that a met conditional with endFlow hides everything after it."""
+        sample_question_group.question_logic = [
+            {"type": "question", "questionId": sample_questions[0].id},
+            {"type": "conditional", "conditional": {
+                "ifIdentifier": sample_questions[0].identifier,
+                "operator": "not_equals",
+                "value": "keep going",
+                "endFlow": True,
+                "nestedItems": [{"type": "question", "questionId": sample_questions[1].id}]
+            }},
+            {"type": "question", "questionId": sample_questions[2].id}
+        ]
+        db_session.commit()
+
+        shown, _ = SessionService._get_questions_from_logic(
+            db_session, sample_question_group, {sample_questions[0].id: "stop"}
+        )
+        assert [q.id for q, _ in shown] == [sample_questions[0].id, sample_questions[1].id]
+
+        shown, _ = SessionService._get_questions_from_logic(
+            db_session, sample_question_group, {sample_questions[0].id: "keep going"}
+        )
+        assert [q.id for q, _ in shown] == [sample_questions[0].id, sample_questions[2].id]
+
     def test_delete_session_success(self, db_session: Session, sample_session):
         """Test deleting a session."""
         success = SessionService.delete_session(
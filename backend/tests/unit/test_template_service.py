@@ -89,6 +89,21 @@ class TestTemplateService:
         assert len(templates) == 3
         assert total == 5
     
+    def test_list_templates_past_end(self, db_session: Session):
+        """Test that a page past the end still reports the total."""
+        with patch('src.services.template_service.DocumentProcessor.validate_markdown', return_value=True):
+            for i in range(2):
+                TemplateService.create_template(
+                    db_session,
+                    TemplateCreate(name=f"Template {i}", template_type="direct", markdown_content=f"# Template {i}"),
+                    1
+                )
+        
+        templates, total = TemplateService.list_templates(db_session, skip=10, limit=3)
+        
+        assert templates == []
+        assert total == 2
+    
     def test_list_templates_with_search(self, db_session: Session):
         """Test listing templates with search."""
         with patch('src.services.template_service.DocumentProcessor.validate_markdown', return_value=True):
@@ -137,6 +152,23 @@ class TestTemplateService:
             assert updated.name == "Updated Name"
             assert updated.markdown_content == "# Updated"
     
+    def test_update_template_unchanged_content(self, db_session: Session):
+        """Test that resubmitting the same markdown skips validation."""
+        with patch('src.services.template_service.DocumentProcessor.validate_markdown', return_value=True):
+            template = TemplateService.create_template(
+                db_session,
+                TemplateCreate(name="Original Name", template_type="direct", markdown_content="# Original"),
+                1
+            )
+        
+        with patch('src.services.template_service.DocumentProcessor.validate_markdown', return_value=False) as validate:
+            updated = TemplateService.update_template(
+                db_session, template.id, TemplateUpdate(markdown_content="# Original")
+            )
+        
+        validate.assert_not_called()
+        assert updated.markdown_content == "# Original"
+    
     def test_update_template_invalid_markdown(self, db_session: Session):
         """Test updating template with invalid markdown."""
         # Create a template
@@ -205,10 +237,7 @@ class TestTemplateService:
             identifiers = TemplateService.get_template_identifiers(db_session, template.id)
             
             assert identifiers is not None
-            assert len(identifiers) == 3
-            assert "client_name" in identifiers
-            assert "dob" in identifiers
-            assert "address" in identifiers
+            assert identifiers == ["client_name", "dob", "address"]
     
     def test_get_template_identifiers_not_found(self, db_session: Session):
         """Test getting identifiers from non-existent template."""
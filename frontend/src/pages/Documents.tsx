@@ -4,13 +4,13 @@ import { sessionService } from '../services/sessionService'
 import { templateService } from '../services/templateService'
 import { GeneratedDocument, DocumentPreview } from '../types/document'
 import { InputForm } from '../types/session'
-import { Template } from '../types/template'
+import { TemplateListItem } from '../types/template'
 import './Documents.css'
 
 const Documents: React.FC = () => {
   const [documents, setDocuments] = useState<GeneratedDocument[]>([])
   const [sessions, setSessions] = useState<InputForm[]>([])
-  const [templates, setTemplates] = useState<Template[]>([])
+  const [templates, setTemplates] = useState<TemplateListItem[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [showGenerateModal, setShowGenerateModal] = useState(false)
@@ -3,13 +3,13 @@ import { useNavigate } from 'react-router-dom'
 import { sessionService } from '../services/sessionService'
 import { templateService } from '../services/templateService'
 import { InputForm } from '../types/session'
-import { Template } from '../types/template'
+import { TemplateListItem } from '../types/template'
 import './MergeDocuments.css'
 
 const MergeDocuments: React.FC = () => {
   const navigate = useNavigate()
   const [sessions, setSessions] = useState<InputForm[]>([])
-  const [templates, setTemplates] = useState<Template[]>([])
+  const [templates, setTemplates] = useState<TemplateListItem[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   
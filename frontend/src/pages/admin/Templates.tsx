@@ -1,13 +1,13 @@
 import React, { useState, useEffect } from 'react'
 import { useSearchParams, useNavigate } from 'react-router-dom'
 import { templateService } from '../../services/templateService'
-import { Template, TemplateCreate, TemplateType } from '../../types/template'
+import { TemplateListItem, TemplateCreate, TemplateType } from '../../types/template'
 import './Templates.css'
 
 const Templates: React.FC = () => {
   const [searchParams, setSearchParams] = useSearchParams()
   const navigate = useNavigate()
-  const [templates, setTemplates] = useState<Template[]>([])
+  const [templates, setTemplates] = useState<TemplateListItem[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [search, setSearch] = useState('')
@@ -52,7 +52,7 @@ const Templates: React.FC = () => {
     }
   }
 
-  const handleEdit = (template: Template) => {
+  const handleEdit = (template: TemplateListItem) => {
     navigate(`/admin/templates/${template.id}/edit`)
   }
 
@@ -15,6 +15,9 @@ export interface Template {
   is_active: boolean
 }
 
+// Templates in list responses omit the markdown content
+export type TemplateListItem = Omit<Template, 'markdown_content'>
+
 export interface TemplateCreate {
   name: string
   description?: string
@@ -31,7 +34,7 @@ export interface TemplateUpdate {
 }
 
 export interface TemplateListResponse {
-  templates: Template[]
+  templates: TemplateListItem[]
   total: number
   page: number
   page_size: number